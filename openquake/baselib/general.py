@@ -960,6 +960,13 @@ def group_array(array, *kfields):
     """
     Convert an array into a dict kfields -> array
     """
+    if (len(kfields) == 1 and isinstance(array, numpy.ndarray) and
+            array.dtype.names):
+        keys = array[kfields[0]]
+        if keys.ndim == 1:  # fast lane, sorting by key in C
+            order = numpy.argsort(keys, kind='stable')
+            uniq, start = numpy.unique(keys[order], return_index=True)
+            return dict(zip(uniq, numpy.split(array[order], start[1:])))
     return groupby(array, operator.itemgetter(*kfields), _reducerecords)
 
 
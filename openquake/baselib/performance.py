@@ -19,6 +19,7 @@
 import os
 import time
 import pickle
+import hashlib
 import getpass
 import operator
 import itertools
@@ -29,6 +30,13 @@ import numpy
 from openquake.baselib.general import humansize
 from openquake.baselib import hdf5
 
+try:
+    from numba import njit
+except ImportError:
+    numba = None
+else:
+    import numba
+
 # NB: one can use vstr fields in extensible datasets, but then reading
 # them on-the-fly in SWMR mode will fail with an OSError:
 # Can't read data (address of object past end of allocation)
@@ -42,6 +50,11 @@ task_info_dt = numpy.dtype(
      ('received', numpy.int64), ('mem_gb', numpy.float32)])
 
 
+# (tmpfile, key, checksum) -> object read by Monitor.read_pik; it is
+# cleared at the end of each calculation by BaseCalculator.run
+pik_cache = {}
+
+
 def init_performance(hdf5file, swmr=False):
     """
     :param hdf5file: file name of hdf5.File instance
@@ -88,6 +101,18 @@ def performance_view(dstore):
     return numpy.array(out, dtlist)
 
 
+def compile(sigstr):
+    """
+    Compile a function Ahead-Of-Time using the given signature string,
+    if numba is installed; otherwise return the function unchanged.
+    The decorated functions must work both in numba nopython mode and as
+    plain Python, so they can use only numpy and math operations.
+    """
+    if numba is None:
+        return lambda func: func
+    return njit(sigstr, error_model='numpy', cache=True)
+
+
 def _pairs(items):
     lst = []
     for name, value in items:
@@ -274,16 +299,36 @@ class Monitor(object):
         f = (hdf5.File(tmp, 'r+') if os.path.exists(tmp)
              else hdf5.File(tmp, 'w'))
         with f:
-            f[key] = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            if key in f:
+                del f[key]
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            f[key] = data
+            f[key].attrs['checksum'] = hashlib.sha1(data).hexdigest()
 
     def read_pik(self, key):
         """
         :param key: key in the _tmp.hdf5 file
         :return: unpickled object
+
+        The object is unpickled only once per process and then cached,
+        since the same object is read by all the tasks of a calculation.
+        The cache key contains the checksum of the pickled data, so an
+        object saved again with different content is unpickled again.
+        NB: all the tasks of a process get the same object, therefore
+        they must treat it as read-only.
         """
         tmp = self.filename[:-5] + '_tmp.hdf5'
         with hdf5.File(tmp, 'r') as f:
-            return pickle.loads(f[key][()])
+            dset = f[key]
+            ident = tmp, key, dset.attrs.get('checksum')
+            if ident not in pik_cache:
+                # forget the objects of other calculations, still there in
+                # long-lived workers, and the previous versions of the object
+                for old in [i for i in pik_cache
+                            if i[0] != tmp or i[1] == key]:
+                    del pik_cache[old]
+                pik_cache[ident] = pickle.loads(dset[()])
+            return pik_cache[ident]
 
     def __repr__(self):
         calc_id = ' #%s ' % self.calc_id if self.calc_id else ' '
@@ -27,7 +27,7 @@ from collections import namedtuple
 from openquake.baselib.general import (
     block_splitter, split_in_blocks, assert_close,
     deprecated, DeprecationWarning, cached_property, start_many,
-    compress, decompress)
+    compress, decompress, group_array)
 
 
 class BlockSplitterTestCase(unittest.TestCase):
@@ -210,3 +210,13 @@ class CompressTestCase(unittest.TestCase):
     def test(self):
         a = dict(a=numpy.array([9999.]))
         self.assertEqual(a, decompress(compress(a)))
+
+
+class GroupArrayTestCase(unittest.TestCase):
+    def test(self):
+        arr = numpy.array([(2, 1.), (1, 2.), (2, 3.), (0, 4.)],
+                          [('sid', numpy.uint32), ('gmv', float)])
+        dic = group_array(arr, 'sid')
+        self.assertEqual(list(dic), [0, 1, 2])
+        numpy.testing.assert_equal(dic[2]['gmv'], [1., 3.])
+        self.assertEqual(group_array(arr[:0], 'sid'), {})
@@ -15,11 +15,13 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import time
+import tempfile
 import unittest
 import pickle
 import numpy
-from openquake.baselib.performance import Monitor
+from openquake.baselib.performance import Monitor, pik_cache
 
 
 class MonitorTestCase(unittest.TestCase):
@@ -60,3 +62,18 @@ class MonitorTestCase(unittest.TestCase):
 
     def test_pickleable(self):
         pickle.loads(pickle.dumps(self.mon))
+
+    def test_save_read_pik(self):
+        mon = Monitor('test')
+        mon.filename = os.path.join(tempfile.mkdtemp(), 'calc.hdf5')
+        mon.save_pik('obj', [1, 2])
+        obj = mon.read_pik('obj')
+        self.assertEqual(obj, [1, 2])
+        self.assertIs(mon.read_pik('obj'), obj)  # cached
+        mon.save_pik('obj', [1, 2])  # same content, same object
+        self.assertIs(mon.read_pik('obj'), obj)
+        mon.save_pik('obj', [3])  # the cache is invalidated immediately
+        obj = mon.read_pik('obj')
+        self.assertEqual(obj, [3])
+        pik_cache.clear()  # as done at the end of a calculation
+        self.assertIsNot(mon.read_pik('obj'), obj)
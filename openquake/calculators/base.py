@@ -30,7 +30,7 @@ import numpy
 
 from openquake.baselib import (
     general, hdf5, datastore, __version__ as engine_version)
-from openquake.baselib import parallel
+from openquake.baselib import parallel, performance
 from openquake.baselib.performance import Monitor, init_performance
 from openquake.hazardlib import InvalidFile, site
 
@@ -58,6 +58,7 @@ TWO16 = 2 ** 16
 TWO32 = 2 ** 32
 
 NUM_SOURCES, CALC_TIME, NUM_SITES, EFF_RUPTURES = 3, 4, 5, 6
+SPLIT_SUFFIX = re.compile(r':\d+$')  # suffix of the IDs of split sources
 
 stats_dt = numpy.dtype([('mean', F32), ('std', F32),
                         ('min', F32), ('max', F32), ('len', U16)])
@@ -275,6 +276,7 @@ class BaseCalculator(metaclass=abc.ABCMeta):
                 readinput.eids = None
                 readinput.smlt_cache.clear()
                 readinput.gsim_lt_cache.clear()
+                performance.pik_cache.clear()
 
                 # remove temporary hdf5 file, if any
                 if os.path.exists(self.datastore.tempname) and remove:
@@ -894,14 +896,13 @@ class HazardCalculator(BaseCalculator):
         """
         Save (eff_ruptures, num_sites, calc_time) inside the source_info
         """
+        source_info = self.csm.source_info
         for src_id, arr in calc_times.items():
-            src_id = re.sub(r':\d+$', '', src_id)
-            row = self.csm.source_info[src_id]
+            row = source_info[SPLIT_SUFFIX.sub('', src_id)]
             row[EFF_RUPTURES] += arr[0]
             row[NUM_SITES] += arr[1]
             row[CALC_TIME] += arr[2]
-        rows = self.csm.source_info.values()
-        recs = [tuple(row) for row in rows]
+        recs = [tuple(row) for row in source_info.values()]
         hdf5.extend(self.datastore['source_info'],
                     numpy.array(recs, readinput.source_info_dt))
 
@@ -1079,10 +1080,10 @@ def save_gmf_data(dstore, sitecol, gmfs, imts, events=()):
     offset = 0
     # convert an array of shape (N, E, M) into an array of type gmv_data_dt
     N, E, M = gmfs.shape
-    lst = [(sitecol.sids[s], ei, gmfs[s, ei])
-           for s in numpy.arange(N, dtype=U32)
-           for ei, event in enumerate(events)]
-    gmfa = numpy.array(lst, dstore['oqparam'].gmf_data_dt())
+    gmfa = numpy.zeros(N * E, dstore['oqparam'].gmf_data_dt())
+    gmfa['sid'] = numpy.repeat(sitecol.sids, E)
+    gmfa['eid'] = numpy.tile(numpy.arange(E, dtype=U32), N)
+    gmfa['gmv'] = gmfs.reshape(N * E, M)
     dstore['gmf_data/sid'] = gmfa['sid']
     dstore['gmf_data/eid'] = gmfa['eid']
     cols = ['sid', 'eid']
@@ -17,7 +17,6 @@
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 import io
 import os
-import re
 import time
 import copy
 import pprint
@@ -214,7 +213,7 @@ class ClassicalCalculator(base.HazardCalculator):
             eff_rups = 0
             eff_sites = 0
             for srcid, rec in d.items():
-                srcids.add(re.sub(r':\d+$', '', srcid))
+                srcids.add(base.SPLIT_SUFFIX.sub('', srcid))
                 eff_rups += rec[0]
                 if rec[0]:
                     eff_sites += rec[1] / rec[0]
@@ -421,14 +420,19 @@ class ClassicalCalculator(base.HazardCalculator):
 
         logging.info('Weighting the sources')
         totweight = 0
+        grp_weights = []  # weight of each source group
         for sg in src_groups:
+            w = 0
             for src in sg:
-                totweight += srcweight(src)
+                sw = srcweight(src)
+                w += sw
+                totweight += sw
                 if src.code == b'C' and src.num_ruptures > 10_000:
                     msg = ('{} is suspiciously large, containing {:_d} '
                            'ruptures with complex_fault_mesh_spacing={} km')
                     spc = oq.complex_fault_mesh_spacing
                     logging.warning(msg.format(src, src.num_ruptures, spc))
+            grp_weights.append(w)
         C = oq.concurrent_tasks or 1
         if oq.calculation_mode == 'preclassical':
             f1 = f2 = preclassical
@@ -451,7 +455,7 @@ class ClassicalCalculator(base.HazardCalculator):
             collapse_level=oq.collapse_level,
             max_sites_disagg=oq.max_sites_disagg,
             af=self.af)
-        for sg in src_groups:
+        for sg, w in zip(src_groups, grp_weights):
             gsims = gsims_by_trt[sg.trt]
             param['rescale_weight'] = len(gsims)
             if sg.atomic:
@@ -471,7 +475,6 @@ class ClassicalCalculator(base.HazardCalculator):
                                   sum(srcweight(src) for src in block))
                     smap.submit((block, gsims, param), f2)
 
-            w = sum(srcweight(src) for src in sg)
             logging.info('TRT = %s', sg.trt)
             it = sorted(oq.maximum_distance.ddic[sg.trt].items())
             md = '%s->%d ... %s->%d' % (it[0] + it[-1])
@@ -489,19 +492,23 @@ class ClassicalCalculator(base.HazardCalculator):
         """
         with self.monitor('saving statistics'):
             for kind in pmap_by_kind:  # i.e. kind == 'hcurves-stats'
-                pmaps = pmap_by_kind[kind]
-                if kind in ('hmaps-rlzs', 'hmaps-stats'):
-                    # pmaps is a list of R pmaps
-                    dset = self.datastore.getitem(kind)
-                    for r, pmap in enumerate(pmaps):
-                        for s in pmap:
-                            dset[s, r] = pmap[s].array  # shape (M, P)
-                elif kind in ('hcurves-rlzs', 'hcurves-stats'):
-                    dset = self.datastore.getitem(kind)
-                    for r, pmap in enumerate(pmaps):
-                        for s in pmap:
-                            dset[s, r] = pmap[s].array.reshape(self.M, self.L1)
-            self.datastore.flush()
+                pmaps = pmap_by_kind[kind]  # a list of R pmaps
+                dset = self.datastore.getitem(kind)
+                for r, pmap in enumerate(pmaps):
+                    if not pmap:
+                        continue
+                    # the sites of a task are in a contiguous range, so the
+                    # data are written with a single slice; the sites
+                    # missing from the pmap have no data and get zeros,
+                    # i.e. the fillvalue of the dataset
+                    sids = pmap.sids
+                    lo = int(sids[0])
+                    arr = numpy.zeros((sids[-1] + 1 - lo,) + dset.shape[2:],
+                                      dset.dtype)
+                    for s in sids:
+                        # shape (M, P) for hmaps, (M, L1) for hcurves
+                        arr[s - lo] = pmap[s].array.reshape(arr.shape[1:])
+                    dset[lo:lo + len(arr), r] = arr
 
     def post_execute(self, pmap_by_key):
         """
@@ -591,6 +598,7 @@ class ClassicalCalculator(base.HazardCalculator):
         parallel.Starmap(
             build_hazard, allargs, distribute=dist, h5=self.datastore.hdf5
         ).reduce(self.save_hazard)
+        self.datastore.flush()  # once, after saving the outputs of all tasks
         if 'hmaps-stats' in self.datastore:
             hmaps = self.datastore.sel('hmaps-stats', stat='mean')  # NSMP
             maxhaz = hmaps.max(axis=(0, 1, 3))
@@ -681,6 +689,8 @@ def build_hazard(pgetter, N, hstats, individual_curves,
         if poes:
             pmap_by_kind['hmaps-stats'] = [
                 ProbabilityMap(M, P) for r in range(S)]
+    if hstats:  # buffer reused for all sites
+        arr = numpy.zeros((R, L, 1))
     combine_mon = monitor('combine pmaps', measuremem=False)
     compute_mon = monitor('compute stats', measuremem=False)
     for sid in pgetter.sids:
@@ -689,11 +699,12 @@ def build_hazard(pgetter, N, hstats, individual_curves,
             if amplifier:
                 pcurves = amplifier.amplify(ampcode[sid], pcurves)
                 # NB: the pcurves have soil levels != IMT levels
-        if sum(pc.array.sum() for pc in pcurves) == 0:  # no data
+        if not any(pc.array.any() for pc in pcurves):  # no data
             continue
         with compute_mon:
             if hstats:
-                arr = numpy.array([pc.array for pc in pcurves])
+                for r, pc in enumerate(pcurves):
+                    arr[r] = pc.array
                 for s, (statname, stat) in enumerate(hstats.items()):
                     pc = getters.build_stat_curve(arr, imtls, stat, weights)
                     pmap_by_kind['hcurves-stats'][s][sid] = pc
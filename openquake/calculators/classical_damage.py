@@ -18,7 +18,6 @@
 
 import numpy
 
-from openquake.baselib.general import AccumDict
 from openquake.hazardlib import stats
 from openquake.calculators import base, classical_risk
 
@@ -36,20 +35,19 @@ def classical_damage(riskinputs, param, monitor):
     :param monitor:
         :class:`openquake.baselib.performance.Monitor` instance
     :yields:
-        dictionaries asset_ordinal -> damage(R, L, D)
+        dictionaries with the asset ordinals and the damages (A, R, L, D)
     """
     crmodel = monitor.read_pik('crmodel')
     for ri in riskinputs:
         R = ri.hazard_getter.num_rlzs
         L = len(crmodel.lti)
         D = len(crmodel.damage_states)
-        result = AccumDict(accum=numpy.zeros((R, L, D), F32))
+        damages = numpy.zeros((len(ri.aids), R, L, D), F32)
         for out in ri.gen_outputs(crmodel, monitor):
             r = out.rlzi
             for l, loss_type in enumerate(crmodel.loss_types):
-                for a, frac in zip(ri.assets['ordinal'], out[loss_type]):
-                    result[a][r, l] = frac
-        yield result
+                damages[:, r, l] = out[loss_type]
+        yield dict(aids=ri.aids, damages=damages)
 
 
 @base.calculators.add('classical_damage')
@@ -60,17 +58,32 @@ class ClassicalDamageCalculator(classical_risk.ClassicalRiskCalculator):
     core_task = classical_damage
     accept_precalc = ['classical']
 
-    def post_execute(self, result):
+    def execute(self):
+        """
+        Run the tasks and collect the damages in a dense array
+        of shape (A, R, L, D)
+        """
+        if not hasattr(self, 'riskinputs'):  # in the reportwriter
+            return
+        D = len(self.crmodel.damage_states)
+        self.damages = numpy.zeros((self.A, self.R, self.L, D), F32)
+        super().execute()
+        return self.damages
+
+    def combine(self, acc, res):
+        """
+        :param acc: unused parameter
+        :param res: a dictionary with the asset ordinals and the damages
+        """
+        self.damages[res['aids']] = res['damages']
+        return acc
+
+    def post_execute(self, damages):
         """
         Export the result in CSV format.
 
-        :param result:
-            a dictionary asset_ordinal -> array(R, L, D)
+        :param damages: an array of shape (A, R, L, D)
         """
-        D = len(self.crmodel.damage_states)
-        damages = numpy.zeros((self.A, self.R, self.L, D), numpy.float32)
-        for a in result:
-            damages[a] = result[a]
         self.datastore['damages-rlzs'] = damages
         stats.set_rlzs_stats(self.datastore, 'damages',
                              assets=self.assetcol['id'],
@@ -44,6 +44,26 @@ gmf_info_dt = numpy.dtype([('rup_id', U32), ('task_no', U16),
                            ('nsites', U16), ('gmfbytes', F32), ('dt', F32)])
 
 
+def build_alt(triples, eids, elt_dt):
+    """
+    :param triples: a list of triples (loss index, event indices, losses)
+    :param eids: the event IDs of the task
+    :param elt_dt: the dtype of the event loss table
+    :returns: an event loss table sorted by event ID
+    """
+    lnis = numpy.concatenate([numpy.full(len(e), lni)
+                              for lni, e, _ in triples])
+    uniq, inv = numpy.unique(numpy.concatenate([e for _, e, _ in triples]),
+                             return_inverse=True)
+    alt = numpy.zeros(len(uniq), elt_dt)
+    alt['event_id'] = eids[uniq]
+    losses = numpy.zeros(alt['loss'].shape, F32)
+    numpy.add.at(losses, (inv, lnis),
+                 numpy.concatenate([ls for _, _, ls in triples]))
+    alt['loss'] = losses
+    return alt
+
+
 def calc_risk(gmfs, param, monitor):
     """
     :param gmfs: an array of GMFs with fields sid, eid, gmv
@@ -58,18 +78,28 @@ def calc_risk(gmfs, param, monitor):
         assets_df = dstore.read_df('assetcol/array', 'ordinal')
     with monitor('getting crmodel'):
         crmodel = monitor.read_pik('crmodel')
-        weights = dstore['weights'][()]
+        # F32 weights, so that `losses @ ws` does not upcast to F64
+        weights = dstore['weights'][()].astype(F32)
     L = len(param['lba'].loss_names)
     elt_dt = [('event_id', U32), ('loss', (F32, (L,)))]
     # aggkey -> eid -> loss
     acc = dict(events_per_sid=0, numlosses=numpy.zeros(2, int))  # (kept, tot)
     lba = param['lba']
-    lba.alt = general.AccumDict(  # idx -> eid -> loss
-        accum=general.AccumDict(accum=numpy.zeros(L, F32)))
-    lba.losses_by_E = general.AccumDict(  # eid -> loss
-        accum=numpy.zeros(L, F32))
+    lba.alt = general.AccumDict(accum=[])  # idx -> [(lni, eidxs, losses)]
+    eids = numpy.unique(gmfs['eid'])
+    lba.losses_by_E = numpy.zeros((len(eids), L), F32)  # eidx -> loss
     tempname = param['tempname']
     aggby = param['aggregate_by']
+    if aggby:
+        # the aggregation keys are stored as linear indices in the space
+        # of the tag indices of the task; they become strings at the end
+        tagarray = assets_df[aggby].to_numpy()
+        tagshape = tuple(tagarray.max(axis=0) + 1)
+        # dense lookup table asset ordinal -> linear tag index, built once
+        # per task instead of once per site
+        tagidx = numpy.zeros(int(assets_df.index.max()) + 1, int)
+        tagidx[assets_df.index.to_numpy()] = numpy.ravel_multi_index(
+            tagarray.T, tagshape)
 
     minimum_loss = []
     for lt, lti in crmodel.lti.items():
@@ -94,20 +124,21 @@ def calc_risk(gmfs, param, monitor):
             assets_by_taxo = get_assets_by_taxo(assets, tempname)  # fast
             out = get_output(crmodel, assets_by_taxo, haz)  # slow
         with mon_agg:
-            tagidxs = assets[aggby] if aggby else None
+            tagidxs = tagidx[assets['ordinal']] if aggby else None
+            eidxs = numpy.searchsorted(eids, haz['eid'])
             acc['numlosses'] += lba.aggregate(
-                out, haz['eid'], minimum_loss, tagidxs, ws)
+                out, eidxs, minimum_loss, tagidxs, ws)
     if len(gmfs):
         acc['events_per_sid'] /= len(gmfs)
-    acc['elt'] = numpy.fromiter(  # this is ultra-fast
-        ((eid, losses)
-         for eid, losses in lba.losses_by_E.items() if losses.sum()),
-        elt_dt)
-    acc['alt'] = {idx: numpy.fromiter(  # already sorted by aid, ultra-fast
-        ((eid, loss) for eid, loss in lba.alt[idx].items()), elt_dt)
-                  for idx in lba.alt}
+    ok = lba.losses_by_E.sum(axis=1) != 0
+    acc['elt'] = elt = numpy.zeros(ok.sum(), elt_dt)
+    elt['event_id'] = eids[ok]
+    elt['loss'] = lba.losses_by_E[ok]
+    acc['alt'] = {
+        ','.join(map(str, numpy.unravel_index(idx, tagshape))) + ',':
+        build_alt(triples, eids, elt_dt) for idx, triples in lba.alt.items()}
     if param['avg_losses']:
-        acc['losses_by_A'] = param['lba'].losses_by_A * param['ses_ratio']
+        acc['losses_by_A'] = param['lba'].losses_by_A * F32(param['ses_ratio'])
         # without resetting the cache the sequential avg_losses would be wrong!
         del param['lba'].__dict__['losses_by_A']
     return acc
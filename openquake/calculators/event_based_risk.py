@@ -20,7 +20,7 @@ import logging
 import operator
 import numpy
 
-from openquake.baselib.general import AccumDict
+from openquake.baselib.performance import compile, numba
 from openquake.baselib.python3compat import zip, encode
 from openquake.hazardlib.stats import set_rlzs_stats
 from openquake.risklib import riskinput, riskmodels
@@ -35,6 +35,29 @@ F64 = numpy.float64
 getweight = operator.attrgetter('weight')
 
 
+@compile("void(f4[:, :], f4[:], f8, i8, f4[:, :], f4[:])")
+def _agg_losses(loss_ratios, avalues, ses_ratio, l, agglosses, avg):
+    # add the losses of each asset to the column l of agglosses, in the
+    # same order and with the same float32 precision of _agg_losses_np;
+    # the average losses are computed in the same pass over the ratios,
+    # summing the ratios in float64 as in _agg_losses_np
+    A, E = loss_ratios.shape
+    for a in range(A):
+        tot = 0.
+        for e in range(E):
+            ratio = loss_ratios[a, e]
+            agglosses[e, l] += ratio * avalues[a]
+            tot += ratio
+        avg[a] = tot * ses_ratio * avalues[a]
+
+
+def _agg_losses_np(loss_ratios, avalues, ses_ratio, l, agglosses, avg):
+    # numpy version of _agg_losses, used when numba is not available
+    avg[:] = loss_ratios.sum(axis=1, dtype=F64) * ses_ratio * avalues
+    for aval, ratios in zip(avalues, loss_ratios):
+        agglosses[:, l] += ratios * aval
+
+
 def event_based_risk(riskinputs, param, monitor):
     """
     :param riskinputs:
@@ -62,36 +85,45 @@ def event_based_risk(riskinputs, param, monitor):
             raise MemoryError(
                 'Building array avg of shape (%d, %d, %d)' % (A, R, L))
         result = dict(aids=ri.aids, avglosses=avg)
-        acc = AccumDict()  # accumulator eidx -> agglosses
-        aid2idx = {aid: idx for idx, aid in enumerate(ri.aids)}
+        # the event losses of all the outputs are written in a single
+        # buffer, which is large enough since there is an output per
+        # realization with at most one row per event
+        E = sum(len(haz) if hasattr(haz, '__len__') else 1
+                for haz in hazard.values())
+        eidxs = numpy.zeros(E, U32)
+        agglosses_buf = numpy.zeros((E, L), F32)
+        start = 0
         if 'builder' in param:
             builder = param['builder']
             P = len(builder.return_periods)
             all_curves = numpy.zeros((A, R, P), builder.loss_dt)
+        # the asset values are the same for all the outputs of the riskinput
+        values = {lt: riskmodels.get_values(lt, ri.assets)
+                  for lt in crmodel.loss_types}
+        values32 = {lt: vals.astype(F32) for lt, vals in values.items()}
         # update the result dictionary and the agg array with each output
         for out in ri.gen_outputs(crmodel, monitor, tempname, hazard):
             if len(out.eids) == 0:  # this happens for sites with no events
                 continue
             r = out.rlzi
-            agglosses = numpy.zeros((len(out.eids), L), F32)
+            stop = start + len(out.eids)
+            agglosses = agglosses_buf[start:stop]
             for l, loss_type in enumerate(crmodel.loss_types):
                 loss_ratios = out[loss_type]
                 if loss_ratios is None:  # for GMFs below the minimum_intensity
                     continue
-                avalues = riskmodels.get_values(loss_type, ri.assets)
-                for a, asset in enumerate(ri.assets):
-                    aval = avalues[a]
-                    aid = asset['ordinal']
-                    idx = aid2idx[aid]
-                    ratios = loss_ratios[a]  # length E
-
-                    # average losses
-                    avg[idx, r, l] = (
-                        ratios.sum(axis=0) * param['ses_ratio'] * aval)
-                    # agglosses
-                    agglosses[:, l] += ratios * aval
-                    if 'builder' in param:
-                        with mon:  # this is the heaviest part
+                avalues = values[loss_type]
+                # the outputs are ordered as ri.assets, i.e. as ri.aids;
+                # both versions multiply by the F32 values, to avoid
+                # upcasting the agglosses to F64
+                agg = (_agg_losses if numba and loss_ratios.dtype == F32
+                       else _agg_losses_np)
+                agg(loss_ratios, values32[loss_type], param['ses_ratio'],
+                    l, agglosses, avg[:, r, l])
+                if 'builder' in param:
+                    with mon:  # this is the heaviest part
+                        for idx, (aval, ratios) in enumerate(
+                                zip(avalues, loss_ratios)):
                             try:
                                 all_curves[idx, r][loss_type] = (
                                     builder.build_curve(aval, ratios, r))
@@ -101,7 +133,8 @@ def event_based_risk(riskinputs, param, monitor):
             # NB: I could yield the agglosses per output, but then I would
             # have millions of small outputs with big data transfer and slow
             # saving time
-            acc += dict(zip(out.eids, agglosses))
+            eidxs[start:stop] = out.eids
+            start = stop
 
         if 'builder' in param:
             clp = param['conditional_loss_poes']
@@ -116,8 +149,14 @@ def event_based_risk(riskinputs, param, monitor):
                     del result['loss_maps-rlzs']
 
         # store info about the GMFs, must be done at the end
-        result['agglosses'] = (numpy.array(list(acc)),
-                               numpy.array(list(acc.values())))
+        if start:  # sum the agglosses by event index
+            eidxs, inv = numpy.unique(eidxs[:start], return_inverse=True)
+            agglosses = numpy.zeros((len(eidxs), L), F32)
+            numpy.add.at(agglosses, inv, agglosses_buf[:start])
+            result['agglosses'] = eidxs, agglosses
+        else:
+            result['agglosses'] = (numpy.array([], U32),
+                                   numpy.zeros((0, L), F32))
         yield result
 
 
@@ -267,10 +306,11 @@ class EbrCalculator(base.RiskCalculator):
         elt_dt = numpy.dtype(
             [('event_id', U32), ('rlzi', U16), ('loss', (F32, (self.L,)))])
         with self.monitor('saving event loss table', measuremem=True):
-            agglosses = numpy.fromiter(
-                ((eid, rlz, losses)
-                 for (eid, rlz), losses in zip(self.events, self.agglosses)
-                 if losses.any()), elt_dt)
+            ok = self.agglosses.any(axis=1)
+            agglosses = numpy.zeros(ok.sum(), elt_dt)
+            agglosses['event_id'] = self.events['id'][ok]
+            agglosses['rlzi'] = self.events['rlz_id'][ok]
+            agglosses['loss'] = self.agglosses[ok]
             self.datastore['losses_by_event'] = agglosses
             self.datastore.set_attrs('losses_by_event', loss_types=loss_types)
         if oq.avg_losses:
@@ -172,18 +172,17 @@ class PmapGetter(object):
         """
         if not pmap_by_grp:
             pmap_by_grp = self.init()
-        pcurves = [probability_map.ProbabilityCurve(numpy.zeros((self.L, 1)))
-                   for _ in range(self.num_rlzs)]
+        # compose the curves in place in a single (R, L, 1) array
+        array = numpy.zeros((self.num_rlzs, self.L, 1))
         for grp, pmap in pmap_by_grp.items():
             try:
                 pc = pmap[sid]
             except KeyError:  # no hazard for sid
                 continue
             for gsim_idx, rlzis in enumerate(self.rlzs_by_grp[grp]):
-                c = probability_map.ProbabilityCurve(pc.array[:, [gsim_idx]])
-                for rlzi in rlzis:
-                    pcurves[rlzi] |= c
-        return pcurves
+                poes = pc.array[:, [gsim_idx]]
+                array[rlzis] = 1. - (1. - array[rlzis]) * (1. - poes)
+        return [probability_map.ProbabilityCurve(arr) for arr in array]
 
     def get_hcurves(self, pmap_by_grp):
         """
@@ -20,18 +20,31 @@ import ast
 import logging
 import itertools
 import numpy
-import pandas
 
 from openquake.baselib import general, parallel, datastore
+from openquake.baselib.performance import compile, numba
 from openquake.baselib.python3compat import encode
 from openquake.hazardlib.stats import set_rlzs_stats
 from openquake.risklib import scientific
 from openquake.calculators import base, views
 
 F32 = numpy.float32
+F64 = numpy.float64
 U32 = numpy.uint32
 
 
+@compile("void(i8[:], f4[:, :], f8[:, :])")
+def _agg_by_event(inv, losses, out):
+    # add the rows of losses to the rows inv of out in a single pass;
+    # the sums are in float64 and in the same order as the bincount
+    # of general.fast_agg, so that the results are the same
+    N, L = losses.shape
+    for i in range(N):
+        k = inv[i]
+        for l in range(L):
+            out[k, l] += losses[i, l]
+
+
 def build_aggkeys(aggregate_by, tagcol, full_aggregate_by):
     """
     :param aggregate_by: what to aggregate
@@ -65,7 +78,8 @@ def get_loss_builder(dstore, return_periods=None, loss_dt=None):
     oq = dstore['oqparam']
     weights = dstore['weights'][()]
     eff_time = oq.investigation_time * oq.ses_per_logic_tree_path
-    num_events = general.countby(dstore['events'][()], 'rlz_id')
+    # count the events per realization reading only the rlz_id column
+    num_events = dict(enumerate(numpy.bincount(dstore['events']['rlz_id'])))
     periods = return_periods or oq.return_periods or scientific.return_periods(
         eff_time, max(num_events.values()))
     return scientific.LossCurvesMapsBuilder(
@@ -74,20 +88,6 @@ def get_loss_builder(dstore, return_periods=None, loss_dt=None):
         eff_time, oq.risk_investigation_time)
 
 
-class AccumLoss(object):
-    def __init__(self, L, eid2rlz):
-        self.L = L
-        self.eid2rlz = eid2rlz
-        self.acc = general.AccumDict(
-            accum=general.AccumDict(accum=numpy.zeros((L,), F32)))
-
-    def accum(self, elt):
-        for rec in elt:
-            eid = rec['event_id']
-            rlz = self.eid2rlz[eid]
-            self.acc[rlz][eid] += rec['loss']
-
-
 def post_ebrisk(dstore, aggkey, monitor):
     """
     :param dstore: a DataStore instance
@@ -97,25 +97,47 @@ def post_ebrisk(dstore, aggkey, monitor):
     """
     dstore.open('r')
     oq = dstore['oqparam']
-    L = len(oq.loss_names)
     agglist = [x if isinstance(x, list) else [x]
                for x in ast.literal_eval(aggkey)]
     idx = tuple(x[0] - 1 for x in agglist if len(x) == 1)
-    evs = dstore['events'][()]
-    al = AccumLoss(L, dict(evs[['id', 'rlz_id']]))
+    dsets = []
     for ids in itertools.product(*agglist):
         key = ','.join(map(str, ids)) + ','
         try:
-            al.accum(dstore['event_loss_table/' + key][:])
+            dset = dstore['event_loss_table/' + key]
         except dstore.EmptyDataset:   # no data
             continue
+        if len(dset):
+            dsets.append(dset)
+    if not dsets:
+        return {}
+    # read the event loss tables directly in a single preallocated array
+    elt = numpy.zeros(sum(len(dset) for dset in dsets), dsets[0].dtype)
+    start = 0
+    for dset in dsets:
+        stop = start + len(dset)
+        dset.read_direct(elt, dest_sel=numpy.s_[start:stop])
+        start = stop
+    # sum the losses by event ID, then split them by realization
+    eids, inv = numpy.unique(elt['event_id'], return_inverse=True)
+    if numba:
+        acc = numpy.zeros((len(eids), elt['loss'].shape[1]), F64)
+        _agg_by_event(inv.astype(numpy.int64), elt['loss'], acc)
+        losses = acc.astype(F32)
+    else:
+        losses = general.fast_agg(inv, elt['loss'])  # shape (E, L)
+    # read only the rlz_id column of the events, in a single h5py call;
+    # the event IDs are the indices of the events table
+    rlz_ids = dstore['events']['rlz_id'][eids]
+    rlzs, rinv = numpy.unique(rlz_ids, return_inverse=True)
+    # the agg_losses of all realizations with a single reduction
+    agg_losses = general.fast_agg(rinv, losses) * F32(oq.ses_ratio)
     builder = get_loss_builder(dstore)
     out = {}
-    for rlz, losses in al.acc.items():
-        array = numpy.array(list(losses.values()))  # shape (E, L)
+    for i, rlz in enumerate(rlzs):
+        array = losses[rinv == i]  # shape (E, L)
         out[rlz] = dict(agg_curves=builder.build_curves(array, rlz),
-                        agg_losses=array.sum(axis=0) * oq.ses_ratio,
-                        idx=idx)
+                        agg_losses=agg_losses[i], idx=idx)
     return out
 
 
@@ -130,10 +152,9 @@ def get_src_loss_table(dstore, L):
     rup_ids = evs['rup_id'][lbe['event_id']]
     source_id = dstore['ruptures']['source_id'][rup_ids]
     w = dstore['weights'][:]
-    acc = general.AccumDict(accum=numpy.zeros(L, F32))
-    for source_id, rlz_id, loss in zip(source_id, rlz_ids, lbe['loss']):
-        acc[source_id] += loss * w[rlz_id]
-    return zip(*sorted(acc.items()))
+    source_ids, inv = numpy.unique(source_id, return_inverse=True)
+    losses = general.fast_agg(inv, lbe['loss'] * w[rlz_ids, None])
+    return source_ids, losses.astype(F32)
 
 
 @base.calculators.add('post_risk')
@@ -190,46 +211,18 @@ class PostRiskCalculator(base.RiskCalculator):
             self.build_datasets(builder, oq.aggregate_by, 'agg_')
         self.build_datasets(builder, [], 'app_')
         self.build_datasets(builder, [], 'tot_')
-        parent = self.datastore.parent
-        full_aggregate_by = (parent['oqparam'].aggregate_by if parent
-                             else ()) or oq.aggregate_by
+        P = len(builder.return_periods)
         if oq.aggregate_by:
-            aggkeys = build_aggkeys(oq.aggregate_by, self.tagcol,
-                                    full_aggregate_by)
-            if parent and 'event_loss_table' in parent:
-                ds = parent
-            else:
-                ds = self.datastore
-                ds.swmr_on()
-            smap = parallel.Starmap(
-                post_ebrisk, [(ds, aggkey) for aggkey in aggkeys],
-                h5=self.datastore.hdf5)
-        else:
-            smap = ()
-        # do everything in process since it is really fast
+            app_curves = self.build_agg_curves(builder)
+        else:  # no tags, nothing to aggregate
+            app_curves = numpy.zeros((P, self.R, self.L), F32)
+        # the app_ and tot_ outputs are accumulated in memory and
+        # written once at the end, instead of one column per realization
+        tot_curves, tot_losses = self.build_tot_curves(builder)
         ds = self.datastore
-        for res in smap:
-            if not res:
-                continue
-            for r, dic in res.items():
-                if oq.aggregate_by:
-                    ds['agg_curves-rlzs'][
-                        (slice(None), r, slice(None)) + dic['idx']  # PRLT..
-                    ] = dic['agg_curves']
-                    ds['agg_losses-rlzs'][
-                        (slice(None), r) + dic['idx']  # LRT...
-                    ] = dic['agg_losses']
-                    ds['app_curves-rlzs'][:, r] += dic['agg_curves']  # PL
-
-        lbe = ds['losses_by_event'][()]
-        rlz_ids = ds['events']['rlz_id'][lbe['event_id']]
-        dic = dict(enumerate(lbe['loss'].T))  # lti -> losses
-        df = pandas.DataFrame(dic, rlz_ids)
-        for r, losses_df in df.groupby(rlz_ids):
-            losses = numpy.array(losses_df)
-            curves = builder.build_curves(losses, r),
-            ds['tot_curves-rlzs'][:, r] = curves  # PL
-            ds['tot_losses-rlzs'][:, r] = losses.sum(axis=0) * oq.ses_ratio
+        ds['app_curves-rlzs'][:] = app_curves
+        ds['tot_curves-rlzs'][:] = tot_curves
+        ds['tot_losses-rlzs'][:] = tot_losses
         units = self.datastore['cost_calculator'].get_units(oq.loss_names)
         aggby = {tagname: encode(getattr(self.tagcol, tagname)[1:])
                  for tagname in oq.aggregate_by}
@@ -249,6 +242,74 @@ class PostRiskCalculator(base.RiskCalculator):
                            loss_types=oq.loss_names, **aggby, units=units)
         return 1
 
+    def build_agg_curves(self, builder):
+        """
+        Store agg_curves-rlzs and agg_losses-rlzs by running post_ebrisk
+        in parallel over the aggregation keys.
+
+        :returns: the app_curves as an array of shape (P, R, L)
+        """
+        oq = self.oqparam
+        parent = self.datastore.parent
+        full_aggregate_by = (parent['oqparam'].aggregate_by if parent
+                             else ()) or oq.aggregate_by
+        aggkeys = build_aggkeys(oq.aggregate_by, self.tagcol,
+                                full_aggregate_by)
+        if parent and 'event_loss_table' in parent:
+            ds = parent
+        else:
+            ds = self.datastore
+            ds.swmr_on()
+        smap = parallel.Starmap(
+            post_ebrisk, [(ds, aggkey) for aggkey in aggkeys],
+            h5=self.datastore.hdf5)
+        P = len(builder.return_periods)
+        app_curves = numpy.zeros((P, self.R, self.L), F32)
+        # fill the outputs in memory and write them once at the end,
+        # instead of performing a small HDF5 write per task and rlz
+        agg_curves = numpy.zeros(self.get_shape(P, self.R, self.L), F32)
+        agg_losses = numpy.zeros(self.get_shape(self.L, self.R), F32)
+        for res in smap:
+            for r, dic in res.items():
+                agg_curves[
+                    (slice(None), r, slice(None)) + dic['idx']  # PRLT..
+                ] = dic['agg_curves']
+                agg_losses[
+                    (slice(None), r) + dic['idx']  # LRT...
+                ] = dic['agg_losses']
+                app_curves[:, r] += dic['agg_curves']  # PL
+        self.datastore['agg_curves-rlzs'][:] = agg_curves
+        self.datastore['agg_losses-rlzs'][:] = agg_losses
+        return app_curves
+
+    def build_tot_curves(self, builder):
+        """
+        Build the total losses and loss curves from losses_by_event;
+        this is really fast, so it is done in process.
+
+        :returns: tot_curves of shape (P, R, L) and tot_losses of shape (L, R)
+        """
+        ds = self.datastore
+        P = len(builder.return_periods)
+        tot_curves = numpy.zeros((P, self.R, self.L), F32)
+        tot_losses = numpy.zeros((self.L, self.R), F32)
+        lbe = ds['losses_by_event'][()]
+        rlz_ids = ds['events']['rlz_id'][lbe['event_id']]
+        # split the (E, L) loss block by realization with a single sort,
+        # working on plain arrays instead of a DataFrame of records
+        losses = lbe['loss']
+        if (numpy.diff(rlz_ids.astype(numpy.int64)) < 0).any():
+            order = numpy.argsort(rlz_ids, kind='stable')
+            rlz_ids, losses = rlz_ids[order], losses[order]
+        # else the table is already grouped, for instance if there is one rlz
+        rlzs, start = numpy.unique(rlz_ids, return_index=True)
+        if len(rlzs):  # sum the losses of all realizations in a single pass
+            tot_losses[:, rlzs] = numpy.add.reduceat(
+                losses, start, axis=0).T * F32(self.oqparam.ses_ratio)
+        for r, array in zip(rlzs, numpy.split(losses, start[1:])):
+            tot_curves[:, r] = builder.build_curves(array, r)  # PL
+        return tot_curves, tot_losses
+
     def post_execute(self, dummy):
         """
         Sanity check on tot_losses
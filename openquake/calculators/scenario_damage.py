@@ -119,8 +119,10 @@ def scenario_damage(riskinputs, param, monitor):
                             by_event[eid][l] += value
 
         res['aed'] = aed = numpy.zeros(len(ddic), param['aed_dt'])
-        for i, ((aid, eid), dd) in enumerate(sorted(ddic.items())):
-            aed[i] = (aid, eid, dd)
+        if ddic:  # fill the columns, not the records one by one
+            keys = sorted(ddic)
+            aed['aid'], aed['eid'] = numpy.array(keys, U32).T
+            aed['dd'] = [ddic[key] for key in keys]
     return res
 
 
@@ -228,8 +230,10 @@ class ScenarioDamageCalculator(base.RiskCalculator):
                                loss_type=oq.loss_names)
             elif name.endswith('_by_event'):
                 arr = numpy.zeros(len(csq), dtlist)
-                for i, (eid, loss) in enumerate(csq.items()):
-                    arr[i] = (eid, rlz[eid], loss)
+                if csq:
+                    arr['event_id'] = eids = list(csq)
+                    arr['rlz_id'] = rlz[eids]
+                    arr['loss'] = list(csq.values())
                 self.datastore[name] = arr
 
     def sanity_check(self):
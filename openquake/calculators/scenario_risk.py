@@ -22,7 +22,6 @@ import numpy
 
 from openquake.baselib import hdf5
 from openquake.baselib.python3compat import zip
-from openquake.baselib.general import AccumDict
 from openquake.hazardlib.stats import set_rlzs_stats
 from openquake.risklib import scientific, riskinput
 from openquake.calculators import base, views
@@ -69,36 +68,45 @@ def scenario_risk(riskinputs, param, monitor):
     :returns:
         a dictionary {
         'agg': array of shape (E, L, R, 2),
-        'avg': list of tuples (lt_idx, rlz_idx, asset_ordinal, statistics)
+        'avg': list of tuples (lt_idx, rlz_idx, asset_ordinals, avg_losses)
         }
         where E is the number of simulated events, L the number of loss types,
-        R the number of realizations  and statistics is an array of shape
-        (n, R, 4), with n the number of assets in the current riskinput object
+        and avg_losses is a float32 array with the average losses of the
+        assets in the current riskinput object
     """
     crmodel = monitor.read_pik('crmodel')
     E = param['E']
     L = len(crmodel.loss_types)
     result = dict(agg=numpy.zeros((E, L), F32), avg=[])
-    acc = AccumDict(accum=numpy.zeros(L, F64))  # aid,eid->loss
+    aels = []  # asset loss tables, one per output
     for ri in riskinputs:
         for out in ri.gen_outputs(crmodel, monitor, param['tempname']):
             r = out.rlzi
+            A, E_ = len(ri.aids), len(out.eids)
+            loss = numpy.zeros((A, E_, L), F32)  # dense buffer per output
+            found = False
             for l, loss_type in enumerate(crmodel.loss_types):
                 losses = out[loss_type]
                 if numpy.product(losses.shape) == 0:  # happens for all NaNs
                     continue
-                avg = numpy.zeros(len(ri.assets), F32)
-                for a, asset in enumerate(ri.assets):
-                    aid = asset['ordinal']
-                    avg[a] = losses[a].mean()
-                    result['avg'].append((l, r, asset['ordinal'], avg[a]))
-                    for loss, eid in zip(losses[a], out.eids):
-                        acc[aid, eid][l] = loss
+                found = True
+                avg = losses.mean(axis=1).astype(F32)
+                result['avg'].append((l, r, ri.aids, avg))
+                loss[:, :, l] = losses
                 agglosses = losses.sum(axis=0)  # shape num_gmfs
                 result['agg'][out.eids, l] += agglosses
-
-    ael = [(aid, eid, loss) for (aid, eid), loss in sorted(acc.items())]
-    result['ael'] = numpy.array(ael, param['ael_dt'])
+            if found:
+                ael = numpy.zeros(A * E_, param['ael_dt'])
+                ael['asset_id'] = numpy.repeat(ri.aids, E_)
+                ael['event_id'] = numpy.tile(out.eids, A)
+                ael['loss'] = loss.reshape(A * E_, L)
+                aels.append(ael)
+
+    if aels:  # sort by asset ID and event ID
+        ael = numpy.concatenate(aels)
+        result['ael'] = ael[numpy.lexsort((ael['event_id'], ael['asset_id']))]
+    else:
+        result['ael'] = numpy.zeros(0, param['ael_dt'])
     return result
 
 
@@ -172,8 +180,8 @@ class ScenarioRiskCalculator(base.RiskCalculator):
 
             # losses by asset
             losses_by_asset = numpy.zeros((A, R, L), F32)
-            for (l, r, aid, avg) in result['avg']:
-                losses_by_asset[aid, r, l] = avg
+            for (l, r, aids, avg) in result['avg']:
+                losses_by_asset[aids, r, l] = avg
             self.datastore['avg_losses-rlzs'] = losses_by_asset
             set_rlzs_stats(self.datastore, 'avg_losses',
                            asset_id=self.assetcol['id'],
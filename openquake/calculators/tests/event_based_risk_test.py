@@ -17,17 +17,20 @@
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 import os
 import logging
+import unittest
 from unittest import mock
 import numpy
 
-from openquake.baselib.general import gettemp
+from openquake.baselib.general import gettemp, fast_agg
 from openquake.baselib.hdf5 import read_csv
 from openquake.commonlib import logs
 from openquake.calculators.views import view, rst_table
 from openquake.calculators.tests import CalculatorTestCase, strip_calc_id
 from openquake.calculators.export import export
 from openquake.calculators.extract import extract
-from openquake.calculators.post_risk import PostRiskCalculator
+from openquake.calculators.post_risk import PostRiskCalculator, _agg_by_event
+from openquake.calculators.event_based_risk import (
+    _agg_losses, _agg_losses_np)
 from openquake.qa_tests_data.event_based_risk import (
     case_1, case_2, case_3, case_4, case_4a, case_6c, case_master, case_miriam,
     occupants, case_1f, case_1g, case_7a, recompute)
@@ -458,3 +461,52 @@ class EventBasedRiskTestCase(CalculatorTestCase):
         oq.hazard_calculation_id = parent.calc_id
         with mock.patch.dict(os.environ, {'OQ_DISTRIBUTE': 'no'}):
             prc.run()
+
+
+class AggLossesTestCase(unittest.TestCase):
+    # the pure Python version of the kernel, if it is compiled by numba
+    agg_losses = staticmethod(getattr(_agg_losses, 'py_func', _agg_losses))
+
+    def setUp(self):
+        rng = numpy.random.RandomState(42)
+        self.loss_ratios = rng.random_sample((5, 7)).astype(numpy.float32)
+        self.avalues = rng.random_sample(5).astype(numpy.float32) * 1000
+
+    def test_avg(self):
+        # the kernel and the numpy version give the same average losses
+        avg1 = numpy.zeros(5, numpy.float32)
+        avg2 = numpy.zeros(5, numpy.float32)
+        self.agg_losses(self.loss_ratios, self.avalues, .1, 0,
+                        numpy.zeros((7, 2), numpy.float32), avg1)
+        _agg_losses_np(self.loss_ratios, self.avalues, .1, 0,
+                       numpy.zeros((7, 2), numpy.float32), avg2)
+        numpy.testing.assert_allclose(avg1, avg2, rtol=1E-6)
+
+    def test_agglosses(self):
+        # the kernel gives the same event losses as the numpy loop, both
+        # in its pure Python version and in its compiled version, if any
+        expected = numpy.zeros((7, 2), numpy.float32)
+        for aval, ratios in zip(self.avalues, self.loss_ratios):
+            expected[:, 1] += ratios * aval
+        for func in {self.agg_losses, _agg_losses}:
+            agglosses = numpy.zeros((7, 2), numpy.float32)
+            func(self.loss_ratios, self.avalues, .1, 1, agglosses,
+                 numpy.zeros(5, numpy.float32))
+            numpy.testing.assert_allclose(agglosses, expected, rtol=1E-6)
+
+
+class AggByEventTestCase(unittest.TestCase):
+    def test_same_as_fast_agg(self):
+        # the kernel of post_ebrisk, both in its pure Python version and in
+        # its compiled version, if any, gives the same sums of fast_agg
+        rng = numpy.random.RandomState(42)
+        losses = (rng.random_sample((20, 3)) * 1000).astype(numpy.float32)
+        inv = rng.randint(0, 4, 20)
+        inv[:4] = numpy.arange(4)  # all the events are present
+        expected = fast_agg(inv, losses)
+        for func in {getattr(_agg_by_event, 'py_func', _agg_by_event),
+                     _agg_by_event}:
+            acc = numpy.zeros((4, 3))
+            func(inv.astype(numpy.int64), losses, acc)
+            numpy.testing.assert_array_equal(
+                acc.astype(numpy.float32), expected)
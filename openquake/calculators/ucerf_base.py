@@ -28,7 +28,7 @@ import zlib
 from openquake.baselib.general import random_filter, AccumDict, cached_property
 from openquake.hazardlib.calc.filters import SourceFilter
 from openquake.hazardlib.source.base import BaseSeismicSource
-from openquake.hazardlib.geo.geodetic import min_geodetic_distance
+from openquake.hazardlib.geo.geodetic import min_geodetic_distance, point_at
 from openquake.hazardlib.geo.surface.planar import PlanarSurface
 from openquake.hazardlib.geo.surface.multi import MultiSurface
 from openquake.hazardlib.geo.utils import KM_TO_DEGREES, angular_distance
@@ -596,6 +596,14 @@ def get_rupture_dimensions(mag, nodal_plane, msr, rupture_aspect_ratio,
     return rup_length, rup_width
 
 
+def _point_at(point, horizontal_distance, vertical_increment, azimuth):
+    # like Point.point_at, but keeping the precision of the coordinates,
+    # i.e. single precision for the locations of the background model
+    lon, lat = point_at(point.longitude, point.latitude, azimuth,
+                        horizontal_distance)
+    return Point._unchecked(lon, lat, point.depth + vertical_increment)
+
+
 def get_rupture_surface(mag, nodal_plane, hypocenter, msr,
                         rupture_aspect_ratio, upper_seismogenic_depth,
                         lower_seismogenic_depth, mesh_spacing=1.0):
@@ -663,9 +671,9 @@ def get_rupture_surface(mag, nodal_plane, hypocenter, msr,
         # we need to move the rupture center to make the rupture fit
         # inside the seismogenic layer.
         hshift = abs(vshift / math.tan(rdip))
-        rupture_center = rupture_center.point_at(
-            horizontal_distance=hshift, vertical_increment=vshift,
-            azimuth=(azimuth_up if vshift < 0 else azimuth_down))
+        rupture_center = _point_at(
+            rupture_center, horizontal_distance=hshift,
+            vertical_increment=vshift, azimuth=(azimuth_up if vshift < 0 else azimuth_down))
 
     # from the rupture center we can now compute the coordinates of the
     # four coorners by moving along the diagonals of the plane. This seems
@@ -680,20 +688,20 @@ def get_rupture_surface(mag, nodal_plane, hypocenter, msr,
         math.atan((rup_proj_width / 2.) / (rup_length / 2.)))
     hor_dist = math.sqrt(
         (rup_length / 2.) ** 2 + (rup_proj_width / 2.) ** 2)
-    left_top = rupture_center.point_at(
-        horizontal_distance=hor_dist,
+    left_top = _point_at(
+        rupture_center, horizontal_distance=hor_dist,
         vertical_increment=-rup_proj_height / 2,
         azimuth=(nodal_plane.strike + 180 + theta) % 360)
-    right_top = rupture_center.point_at(
-        horizontal_distance=hor_dist,
+    right_top = _point_at(
+        rupture_center, horizontal_distance=hor_dist,
         vertical_increment=-rup_proj_height / 2,
         azimuth=(nodal_plane.strike - theta) % 360)
-    left_bottom = rupture_center.point_at(
-        horizontal_distance=hor_dist,
+    left_bottom = _point_at(
+        rupture_center, horizontal_distance=hor_dist,
         vertical_increment=rup_proj_height / 2,
         azimuth=(nodal_plane.strike + 180 - theta) % 360)
-    right_bottom = rupture_center.point_at(
-        horizontal_distance=hor_dist,
+    right_bottom = _point_at(
+        rupture_center, horizontal_distance=hor_dist,
         vertical_increment=rup_proj_height / 2,
         azimuth=(nodal_plane.strike + theta) % 360)
     return PlanarSurface(nodal_plane.strike, nodal_plane.dip,
@@ -738,7 +746,8 @@ def generate_background_ruptures(tom, locations, occurrence, mag, npd,
     depths = hdd.sample_pairs(n_vals)
     nodal_planes = npd.sample_pairs(n_vals)
     for i, (x, y) in enumerate(locations):
-        hypocentre = Point(x, y, depths[i][1])
+        # the locations are valid and stored in single precision
+        hypocentre = Point._unchecked(x, y, depths[i][1])
         surface = get_rupture_surface(mag, nodal_planes[i][1],
                                       hypocentre, msr, aspect,
                                       upper_seismogenic_depth,
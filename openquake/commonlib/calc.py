@@ -141,22 +141,19 @@ def compute_hazard_maps(curves, imls, poes):
         warnings.simplefilter("ignore")
         # avoid RuntimeWarning: divide by zero for zero levels
         imls = numpy.log(numpy.array(imls[::-1]))
-    for n, curve in enumerate(curves):
-        # the hazard curve, having replaced the too small poes with EPSILON
-        log_cutoff = numpy.log([max(poe, EPSILON) for poe in curve[::-1]])
-        for p, log_poe in enumerate(log_poes):
-            if log_poe > log_cutoff[-1]:
-                # special case when the interpolation poe is bigger than the
-                # maximum, i.e the iml must be smaller than the minumum
-                # extrapolate the iml to zero as per
-                # https://bugs.launchpad.net/oq-engine/+bug/1292093
-                # a consequence is that if all poes are zero any poe > 0
-                # is big and the hmap goes automatically to zero
-                pass
-            else:
-                # exp-log interpolation, to reduce numerical errors
-                # see https://bugs.launchpad.net/oq-engine/+bug/1252770
-                hmap[n, p] = numpy.exp(numpy.interp(log_poe, log_cutoff, imls))
+    # the hazard curves, having replaced the too small poes with EPSILON
+    log_cutoffs = numpy.log(numpy.maximum(curves[:, ::-1], EPSILON))
+    for n, log_cutoff in enumerate(log_cutoffs):
+        # special case when the interpolation poe is bigger than the
+        # maximum, i.e the iml must be smaller than the minumum
+        # extrapolate the iml to zero as per
+        # https://bugs.launchpad.net/oq-engine/+bug/1292093
+        # a consequence is that if all poes are zero any poe > 0
+        # is big and the hmap goes automatically to zero
+        ok = log_poes <= log_cutoff[-1]
+        # exp-log interpolation, to reduce numerical errors
+        # see https://bugs.launchpad.net/oq-engine/+bug/1252770
+        hmap[n, ok] = numpy.exp(numpy.interp(log_poes[ok], log_cutoff, imls))
     return hmap
 
 
@@ -222,17 +219,14 @@ def make_hmap(pmap, imtls, poes, sid=None):
         pmap = {sid: pmap}
         sids = [sid]
     M, P = len(imtls), len(poes)
-    hmap = probability_map.ProbabilityMap.build(M, P, sids, dtype=F32)
-    if len(pmap) == 0:
-        return hmap  # empty hazard map
-    for i, imt in enumerate(imtls):
-        curves = numpy.array([pmap[sid].array[imtls(imt), 0] for sid in sids])
-        data = compute_hazard_maps(curves, imtls[imt], poes)  # array (N, P)
-        for sid, value in zip(sids, data):
-            array = hmap[sid].array
-            for j, val in enumerate(value):
-                array[i, j] = val
-    return hmap
+    if len(pmap) == 0:  # empty hazard map
+        return probability_map.ProbabilityMap.build(M, P, sids, dtype=F32)
+    curves = numpy.array([pmap[sid].array[:, 0] for sid in sids])  # (N, L)
+    data = numpy.zeros((len(sids), M, P), F32)
+    for m, imt in enumerate(imtls):
+        data[:, m] = compute_hazard_maps(
+            curves[:, imtls(imt)], imtls[imt], poes)
+    return probability_map.ProbabilityMap.from_array(data, sids)
 
 
 def make_uhs(hmap, info):
@@ -21,6 +21,7 @@
 :func:`disaggregation` as well as several aggregation functions for
 extracting a specific PMF from the result of :func:`disaggregation`.
 """
+import math
 import warnings
 import operator
 import collections
@@ -51,6 +52,14 @@ def assert_same_shape(arrays):
         assert arr.shape == shape, (arr.shape, shape)
 
 
+def _edges(lo, hi, width):
+    # bin edges multiple of width enclosing the interval [lo, hi];
+    # math.floor/ceil are used since they are much faster than the numpy
+    # functions on Python floats
+    return width * numpy.arange(math.floor(lo / width),
+                                math.ceil(hi / width) + 1)
+
+
 def get_edges_shapedic(oq, sitecol, mags_by_trt):
     """
     :returns: (mag dist lon lat eps trt) edges and shape dictionary
@@ -69,14 +78,11 @@ def get_edges_shapedic(oq, sitecol, mags_by_trt):
         mags.update(float(mag) for mag in _mags)
         trts.append(trt)
     mags = sorted(mags)
-    mag_edges = oq.mag_bin_width * numpy.arange(
-        int(numpy.floor(min(mags) / oq.mag_bin_width)),
-        int(numpy.ceil(max(mags) / oq.mag_bin_width) + 1))
+    mag_edges = _edges(mags[0], mags[-1], oq.mag_bin_width)
 
     # build dist_edges
     maxdist = max(oq.maximum_distance(trt) for trt in trts)
-    dist_edges = oq.distance_bin_width * numpy.arange(
-        0, int(numpy.ceil(maxdist / oq.distance_bin_width) + 1))
+    dist_edges = _edges(0, maxdist, oq.distance_bin_width)
 
     # build eps_edges
     eps_edges = numpy.linspace(-tl, tl, oq.num_epsilon_bins + 1)
@@ -202,7 +208,7 @@ def lon_lat_bins(lon, lat, size_km, coord_bin_width):
     :param coord_bin_width: bin width in degrees
     :returns: two arrays lon bins, lat bins
     """
-    nbins = numpy.ceil(size_km * KM_TO_DEGREES / coord_bin_width)
+    nbins = math.ceil(size_km * KM_TO_DEGREES / coord_bin_width)
     delta_lon = min(angular_distance(size_km, lat), 180)
     delta_lat = min(size_km * KM_TO_DEGREES, 90)
     EPS = .001  # avoid discarding the last edgebdata.pnes.shape
@@ -377,9 +383,7 @@ def disaggregation(
         rups[trt].extend(cmaker[trt].from_srcs(srcs, sitecol))
     min_mag = min(r.mag for rs in rups.values() for r in rs)
     max_mag = max(r.mag for rs in rups.values() for r in rs)
-    mag_bins = mag_bin_width * numpy.arange(
-        int(numpy.floor(min_mag / mag_bin_width)),
-        int(numpy.ceil(max_mag / mag_bin_width) + 1))
+    mag_bins = _edges(min_mag, max_mag, mag_bin_width)
 
     for trt in cmaker:
         gsim = gsim_by_trt[trt]
@@ -395,9 +399,7 @@ def disaggregation(
 
     min_dist = min(bd.dists.min() for bd in bdata.values())
     max_dist = max(bd.dists.max() for bd in bdata.values())
-    dist_bins = dist_bin_width * numpy.arange(
-        int(numpy.floor(min_dist / dist_bin_width)),
-        int(numpy.ceil(max_dist / dist_bin_width) + 1))
+    dist_bins = _edges(min_dist, max_dist, dist_bin_width)
     lon_bins, lat_bins = lon_lat_bins(site.location.x, site.location.y,
                                       max_dist, coord_bin_width)
     eps_bins = numpy.linspace(-truncation_level, truncation_level,
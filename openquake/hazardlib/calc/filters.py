@@ -292,6 +292,21 @@ class SourceFilter(object):
             integration_distance
             if isinstance(integration_distance, MagDepDistance)
             else MagDepDistance(integration_distance))
+        # the KD-trees on the site coordinates used by ._sids_within,
+        # idl -> (lons, kdtree), with the longitudes in the range [0, 360]
+        # for the sources crossing the International Date Line; they are
+        # built once here, so the sitecol must not be changed later
+        self.lonlat_kdts = {}
+        if sitecol is not None:
+            self.lon_range = sitecol.lons.min(), sitecol.lons.max()
+            for idl in (False, True):
+                lons = sitecol.lons % 360 if idl else sitecol.lons
+                self.lonlat_kdts[idl] = lons, cKDTree(
+                    numpy.column_stack([lons, sitecol.lats]))
+
+    def __reduce__(self):
+        # the KD-trees are not pickled, they are rebuilt by __init__
+        return self.__class__, (self.sitecol, self.integration_distance)
 
     def get_rectangle(self, src):
         """
@@ -388,11 +403,30 @@ class SourceFilter(object):
                 src.indices = self.sitecol.sids
                 yield src
                 continue
-            indices = self.sitecol.within_bbox(box)
+            indices = self._sids_within(box)
             if len(indices):
                 src.indices = indices
                 yield src
 
+    def _sids_within(self, box):
+        # equivalent to self.sitecol.within_bbox(box), but using a KD-tree
+        # on the site coordinates to find the candidate sites in the square
+        # containing the box: then only the candidates are checked exactly
+        min_lon, min_lat, max_lon, max_lat = box
+        idl = cross_idl(min_lon, max_lon, *self.lon_range)
+        if idl:  # work in the range [0, 360]
+            min_lon, max_lon = min_lon % 360, max_lon % 360
+        all_lons, kdt = self.lonlat_kdts[idl]
+        center = (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+        radius = max(max_lon - min_lon, max_lat - min_lat) / 2
+        sids = numpy.array(kdt.query_ball_point(center, radius, p=numpy.inf),
+                           int)
+        sids.sort()
+        lons, lats = all_lons[sids], self.sitecol.lats[sids]
+        ok = ((min_lon < lons) & (lons < max_lon) &
+              (min_lat < lats) & (lats < max_lat))
+        return sids[ok]
+
     def within_bbox(self, srcs):
         """
         :param srcs: a list of source objects
@@ -412,10 +446,12 @@ class SourceFilter(object):
             lats.append(box[1])
             lons.append(box[2])
             lats.append(box[3])
-        if cross_idl(*(list(self.sitecol.lons) + lons)):
-            lons = numpy.array(lons) % 360
-        else:
-            lons = numpy.array(lons)
+        # cross_idl depends only on the extreme longitudes
+        lons = numpy.array(lons)
+        site_lons = self.sitecol.lons
+        if cross_idl(min(site_lons.min(), lons.min()),
+                     max(site_lons.max(), lons.max())):
+            lons %= 360
         bbox = (lons.min(), min(lats), lons.max(), max(lats))
         if bbox[2] - bbox[0] > 180:
             raise BBoxError(
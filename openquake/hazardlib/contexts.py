@@ -503,6 +503,12 @@ class PmapMaker(object):
         self.poe_mon = cmaker.mon('get_poes', measuremem=False)
         self.pne_mon = cmaker.mon('composing pnes', measuremem=False)
         self.gmf_mon = cmaker.mon('computing mean_std', measuremem=False)
+        # pairs (levels slice, gsim index) for the IMTs where the gsim has
+        # weight 0, computed once here and not for each context
+        self.zero_weights = [
+            (self.loglevels(imt), g) for g, gsim in enumerate(self.gsims)
+            if hasattr(gsim, 'weight')
+            for imt in self.loglevels if gsim.weight[imt] == 0]
 
     def _update_pmap(self, ctxs, pmap=None):
         # compute PoEs and update pmap
@@ -523,12 +529,11 @@ class PmapMaker(object):
                     sitecode = None
                 poes = base.get_poes(mean_std, ll, self.trunclevel, self.gsims,
                                      af, ctx.mag, sitecode, ctx.rrup)
-                for g, gsim in enumerate(self.gsims):
-                    for m, imt in enumerate(ll):
-                        if hasattr(gsim, 'weight') and gsim.weight[imt] == 0:
-                            # set by the engine when parsing the gsim logictree
-                            # when 0 ignore the gsim: see _build_trts_branches
-                            poes[:, ll(imt), g] = 0
+                for slc, g in self.zero_weights:
+                    # the weight is set by the engine when parsing the gsim
+                    # logictree; when 0 ignore the gsim: see
+                    # _build_trts_branches
+                    poes[:, slc, g] = 0
 
             with self.pne_mon:
                 # pnes and poes of shape (N, L, G)
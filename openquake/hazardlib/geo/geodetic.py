@@ -93,7 +93,7 @@ def distance(lons1, lats1, depths1, lons2, lats2, depths2):
     """
     hdist = geodetic_distance(lons1, lats1, lons2, lats2)
     vdist = depths1 - depths2
-    return numpy.sqrt(hdist ** 2 + vdist ** 2)
+    return numpy.hypot(hdist, vdist)
 
 
 def min_distance_to_segment(seglons, seglats, lons, lats):
@@ -292,7 +292,7 @@ def intervals_between(lon1, lat1, depth1, lon2, lat2, depth2, length):
     # should have the same number of intervals. To reduce potential differences
     # due to floating point errors, we therefore round total_distance to a
     # fixed precision (7)
-    total_distance = round(numpy.sqrt(hdist ** 2 + vdist ** 2), 7)
+    total_distance = round(numpy.hypot(hdist, vdist), 7)
     num_intervals = int(round(total_distance / length))
     if num_intervals == 0:
         return numpy.array([lon1]), numpy.array([lat1]), numpy.array([depth1])
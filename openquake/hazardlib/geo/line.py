@@ -19,10 +19,69 @@
 """
 Module :mod:`openquake.hazardlib.geo.line` defines :class:`Line`.
 """
+import math
 import numpy
 
+from openquake.baselib.performance import compile
+from openquake.baselib.python3compat import round
 from openquake.hazardlib.geo import geodetic
 from openquake.hazardlib.geo import utils
+from openquake.hazardlib.geo.point import Point
+
+
+# the same rounding (half away from zero) used in geodetic.intervals_between
+_round = compile("f8(f8, i8)")(round)
+
+
+@compile("f8[:, :](f8[:, :], f8)")
+def _resample(coo, section_length):
+    # 1. Resample the first section. 2. Loop over the remaining points
+    # in the line and resample the remaining sections.
+    # 3. Extend the list with the resampled points, except the first one
+    # (because it's already contained in the previous set of
+    # resampled points).
+    # Each section is computed as in geodetic.intervals_between, with
+    # scalar math so that the kernel can be compiled by numba
+    lons, lats, deps = [coo[0, 0]], [coo[0, 1]], [coo[0, 2]]
+    for i in range(1, len(coo)):
+        lon1, lat1, depth1 = lons[-1], lats[-1], deps[-1]
+        rlon1, rlat1 = math.radians(lon1), math.radians(lat1)
+        rlon2, rlat2 = math.radians(coo[i, 0]), math.radians(coo[i, 1])
+        sin_lat1, cos_lat1 = math.sin(rlat1), math.cos(rlat1)
+        cos_lat2 = math.cos(rlat2)
+        hdist = 2 * geodetic.EARTH_RADIUS * math.asin(math.sqrt(
+            math.sin((rlat1 - rlat2) / 2.0) ** 2.0
+            + cos_lat1 * cos_lat2 * math.sin((rlon1 - rlon2) / 2.0) ** 2.0))
+        vdist = coo[i, 2] - depth1
+        # round to 7 digits, see the comment in geodetic.intervals_between;
+        # numpy.hypot and not math.hypot, which rounds differently
+        total_distance = _round(numpy.hypot(hdist, vdist), 7)
+        num_intervals = int(_round(total_distance / section_length, 0))
+        if num_intervals == 0:
+            continue
+        dist_factor = (section_length * num_intervals) / total_distance
+        true_course = math.degrees(math.atan2(
+            math.sin(rlon1 - rlon2) * cos_lat2,
+            cos_lat1 * math.sin(rlat2)
+            - sin_lat1 * cos_lat2 * math.cos(rlon1 - rlon2)))
+        tc = math.radians(360 - (360 - true_course) % 360)
+        hstep = (hdist * dist_factor / geodetic.EARTH_RADIUS) / num_intervals
+        vstep = vdist * dist_factor / num_intervals
+        for k in range(1, num_intervals + 1):
+            sin_dist, cos_dist = math.sin(k * hstep), math.cos(k * hstep)
+            sin_lat = sin_lat1 * cos_dist + cos_lat1 * sin_dist * math.cos(tc)
+            dlon = math.atan2(math.sin(tc) * sin_dist * cos_lat1,
+                              cos_dist - sin_lat1 * sin_lat)
+            lon = (rlon1 - dlon + math.pi) % (2 * math.pi) - math.pi
+            lons.append(math.degrees(lon))
+            lats.append(math.degrees(math.asin(sin_lat)))
+            deps.append(k * vstep + depth1)
+    out = numpy.empty((len(lons), 3))
+    for i in range(len(lons)):
+        out[i, 0] = lons[i]
+        out[i, 1] = lats[i]
+        out[i, 2] = deps[i]
+    return out
 
 
 class Line(object):
@@ -36,6 +95,11 @@ class Line(object):
         The sequence of points defining this line.
     :type points:
         list of :class:`~openquake.hazardlib.geo.point.Point` instances
+
+    The coordinates of the points are also available as the property
+    ``.coo``, an array of shape (N, 3) with columns longitude, latitude and
+    depth, used by the methods of the line to work on arrays instead of
+    points.
     """
 
     def __init__(self, points):
@@ -44,6 +108,16 @@ class Line(object):
         if len(self.points) < 1:
             raise ValueError("One point needed to create a line!")
 
+    @property
+    def coo(self):
+        """
+        :returns: an array of shape (N, 3) built from the current points
+        """
+        n = len(self.points)
+        coords = (c for p in self.points
+                  for c in (p.longitude, p.latitude, p.depth))
+        return numpy.fromiter(coords, float, 3 * n).reshape(n, 3)
+
     def __eq__(self, other):
         """
         >>> from openquake.hazardlib.geo.point import Point
@@ -78,7 +152,7 @@ class Line(object):
         :returns bool:
             True if this line is on the surface, false otherwise.
         """
-        return all(point.on_surface() for point in self.points)
+        return bool((self.coo[:, 2] == 0.).all())
 
     def horizontal(self):
         """
@@ -88,7 +162,8 @@ class Line(object):
         :returns bool:
             True if this line is horizontal, false otherwise.
         """
-        return all(p.depth == self[0].depth for p in self)
+        depths = self.coo[:, 2]
+        return bool((depths == depths[0]).all())
 
     def average_azimuth(self):
         """
@@ -109,8 +184,7 @@ class Line(object):
         """
         if len(self.points) == 2:
             return self.points[0].azimuth(self.points[1])
-        lons = numpy.array([point.longitude for point in self.points])
-        lats = numpy.array([point.latitude for point in self.points])
+        lons, lats, _ = self.coo.T
         azimuths = geodetic.azimuth(lons[:-1], lats[:-1], lons[1:], lats[1:])
         distances = geodetic.geodetic_distance(lons[:-1], lats[:-1],
                                                lons[1:], lats[1:])
@@ -119,11 +193,8 @@ class Line(object):
         # the average coordinate of each component
         avg_x = numpy.mean(distances * numpy.sin(azimuths))
         avg_y = numpy.mean(distances * numpy.cos(azimuths))
-        # find the mean azimuth from that mean vector
-        azimuth = numpy.degrees(numpy.arctan2(avg_x, avg_y))
-        if azimuth < 0:
-            azimuth += 360
-        return azimuth
+        # find the mean azimuth from that mean vector, in the range [0, 360)
+        return numpy.degrees(numpy.arctan2(avg_x, avg_y)) % 360
 
     def resample(self, section_length):
         """
@@ -165,28 +236,8 @@ class Line(object):
         if len(self.points) < 2:
             return Line(self.points)
 
-        resampled_points = []
-
-        # 1. Resample the first section. 2. Loop over the remaining points
-        # in the line and resample the remaining sections.
-        # 3. Extend the list with the resampled points, except the first one
-        # (because it's already contained in the previous set of
-        # resampled points).
-
-        resampled_points.extend(
-            self.points[0].equally_spaced_points(self.points[1],
-                                                 section_length)
-        )
-
-        # Skip the first point, it's already resampled
-        for i in range(2, len(self.points)):
-            points = resampled_points[-1].equally_spaced_points(
-                self.points[i], section_length
-            )
-
-            resampled_points.extend(points[1:])
-
-        return Line(resampled_points)
+        coo = _resample(self.coo, section_length)
+        return Line([Point._unchecked(lon, lat, dep) for lon, lat, dep in coo])
 
     def get_length(self):
         """
@@ -196,11 +247,14 @@ class Line(object):
         :returns:
             Total length in km.
         """
-        length = 0
-        for i, point in enumerate(self.points):
-            if i != 0:
-                length += point.distance(self.points[i - 1])
-        return length
+        return self._segment_lengths().sum()
+
+    def _segment_lengths(self):
+        # distances between consecutive points, computed with a single
+        # vectorized call instead of one Point.distance call per segment
+        lons, lats, deps = self.coo.T
+        return geodetic.distance(lons[:-1], lats[:-1], deps[:-1],
+                                 lons[1:], lats[1:], deps[1:])
 
     def resample_to_num_points(self, num_points):
         """
@@ -213,7 +267,8 @@ class Line(object):
         """
         assert len(self.points) > 1, "can not resample the line of one point"
 
-        section_length = self.get_length() / (num_points - 1)
+        seg_lengths = self._segment_lengths()
+        section_length = seg_lengths.sum() / (num_points - 1)
         resampled_points = [self.points[0]]
 
         segment = 0
@@ -223,9 +278,7 @@ class Line(object):
         for i in range(num_points - 1):
             tot_length = (i + 1) * section_length
             while tot_length > acc_length and segment < len(self.points) - 1:
-                last_segment_length = self.points[segment].distance(
-                    self.points[segment + 1]
-                )
+                last_segment_length = seg_lengths[segment]
                 acc_length += last_segment_length
                 segment += 1
             p1, p2 = self.points[segment - 1:segment + 1]
@@ -241,3 +294,37 @@ class Line(object):
             resampled_points.append(resampled)
 
         return Line(resampled_points)
+
+    def resample_at(self, distances):
+        """
+        Compute the points of the line at the given distances from its
+        first point, measured along the line.
+
+        :param distances:
+            Array of distances in km, which must be between 0 and the
+            length of the line; they are not required to be sorted.
+        :returns:
+            An array of shape (M, 3) with the longitudes, latitudes and
+            depths of the points, in the same order as the distances.
+        """
+        assert len(self.points) > 1, "can not resample the line of one point"
+        distances = numpy.asarray(distances, float)
+        seg_lengths = self._segment_lengths()
+        cum = numpy.concatenate([[0.], numpy.cumsum(seg_lengths)])
+        assert ((distances >= 0) & (distances <= cum[-1])).all(), (
+            'distances outside the range [0, %s]' % cum[-1])
+        # index of the segment containing each distance; the end of the line
+        # belongs to the last segment
+        idx = numpy.searchsorted(cum, distances, side='right') - 1
+        idx = numpy.minimum(idx, len(seg_lengths) - 1)
+        frac = (distances - cum[idx]) / seg_lengths[idx]
+        lons, lats, deps = self.coo.T
+        lons1, lats1, deps1 = lons[idx], lats[idx], deps[idx]
+        lons2, lats2, deps2 = lons[idx + 1], lats[idx + 1], deps[idx + 1]
+        azimuths = geodetic.azimuth(lons1, lats1, lons2, lats2)
+        hdists = geodetic.geodetic_distance(lons1, lats1, lons2, lats2)
+        out = numpy.empty((len(distances), 3))
+        out[:, 0], out[:, 1] = geodetic.point_at(
+            lons1, lats1, azimuths, hdists * frac)
+        out[:, 2] = deps1 + (deps2 - deps1) * frac
+        return out
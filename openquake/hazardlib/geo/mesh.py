@@ -686,9 +686,7 @@ class RectangularMesh(Mesh):
         xx += numpy.sum(br_area * az_cos)
         yy += numpy.sum(br_area * sqrt(1 - az_cos * az_cos) * sign)
 
-        azimuth = numpy.degrees(numpy.arctan2(yy, xx))
-        if azimuth < 0:
-            azimuth += 360
+        azimuth = numpy.degrees(numpy.arctan2(yy, xx)) % 360
 
         if inclination > 90:
             # average inclination is over 90 degree, that means that we need
@@ -19,12 +19,46 @@
 """
 Module :mod:`openquake.hazardlib.geo.point` defines :class:`Point`.
 """
+import math
 import numpy
 import shapely.geometry
 
+from openquake.baselib.performance import compile
 from openquake.hazardlib.geo import geodetic
 from openquake.hazardlib.geo import utils as geo_utils
 
+_KM_PER_DEGREE = math.radians(geodetic.EARTH_RADIUS)
+
+
+def _distance(lon1, lat1, depth1, lon2, lat2, depth2):
+    # scalar version of geodetic.distance, using the math module: it is
+    # several times faster than going through numpy for a single pair and
+    # it gives the same results for double precision coordinates
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    hdist = 2 * geodetic.EARTH_RADIUS * math.asin(math.sqrt(
+        math.sin((lat1 - lat2) / 2.0) ** 2.0
+        + math.cos(lat1) * math.cos(lat2)
+        * math.sin((lon1 - lon2) / 2.0) ** 2.0))
+    vdist = depth1 - depth2
+    # numpy.hypot and not math.hypot, which rounds differently
+    return numpy.hypot(hdist, vdist)
+
+
+@compile("UniTuple(f8, 2)(f8, f8, f8, f8)")
+def _point_at(lon, lat, azimuth, distance):
+    # scalar version of geodetic.point_at, compiled with numba if available
+    lon, lat = math.radians(lon), math.radians(lat)
+    tc = math.radians(360 - azimuth)
+    sin_dists = math.sin(distance / geodetic.EARTH_RADIUS)
+    cos_dists = math.cos(distance / geodetic.EARTH_RADIUS)
+    sin_lat = math.sin(lat)
+    cos_lat = math.cos(lat)
+    sin_lats = sin_lat * cos_dists + cos_lat * sin_dists * math.cos(tc)
+    dlon = math.atan2(math.sin(tc) * sin_dists * cos_lat,
+                      cos_dists - sin_lat * sin_lats)
+    lons = (lon - dlon + math.pi) % (2 * math.pi) - math.pi
+    return math.degrees(lons), math.degrees(math.asin(sin_lats))
+
 
 class Point(object):
     """
@@ -64,9 +98,19 @@ class Point(object):
         if not -90.0 <= latitude <= 90.0:
             raise ValueError("latitude %.6f outside range" % latitude)
 
+        self.depth = float(depth)
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+
+    @classmethod
+    def _unchecked(cls, longitude, latitude, depth):
+        # build a point skipping the validation of the coordinates; to be
+        # used only with coordinates computed from already valid points
+        self = cls.__new__(cls)
         self.depth = depth
         self.latitude = latitude
         self.longitude = longitude
+        return self
 
     @property
     def x(self):
@@ -115,9 +159,9 @@ class Point(object):
         :rtype:
             Instance of :class:`Point`
         """
-        lon, lat = geodetic.point_at(self.longitude, self.latitude,
-                                     azimuth, horizontal_distance)
-        return Point(lon, lat, self.depth + vertical_increment)
+        lon, lat = _point_at(self.longitude, self.latitude,
+                             float(azimuth), float(horizontal_distance))
+        return Point._unchecked(lon, lat, self.depth + vertical_increment)
 
     def azimuth(self, point):
         """
@@ -154,8 +198,8 @@ class Point(object):
         :rtype:
             float
         """
-        return geodetic.distance(self.longitude, self.latitude, self.depth,
-                                 point.longitude, point.latitude, point.depth)
+        return _distance(self.longitude, self.latitude, self.depth,
+                         point.longitude, point.latitude, point.depth)
 
     def distance_to_mesh(self, mesh, with_depths=True):
         """
@@ -218,7 +262,20 @@ class Point(object):
         """
         if other is None:
             return False
-        return abs(self.distance(other)) <= self.EQUALITY_DISTANCE
+        # cheap scalar checks first: the vertical distance and the distance
+        # along the meridian are both lower bounds of the distance
+        if abs(self.depth - other.depth) > self.EQUALITY_DISTANCE:
+            return False
+        elif (abs(self.latitude - other.latitude) * _KM_PER_DEGREE >
+              self.EQUALITY_DISTANCE):
+            return False
+        elif (self.longitude == other.longitude and
+              self.latitude == other.latitude):
+            return True
+        return abs(_distance(
+            self.longitude, self.latitude, self.depth,
+            other.longitude, other.latitude, other.depth)
+        ) <= self.EQUALITY_DISTANCE
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -254,7 +311,8 @@ class Point(object):
             self.longitude, self.latitude, self.depth,
             point.longitude, point.latitude, point.depth,
             distance)
-        return [Point(lons[i], lats[i], depths[i]) for i in range(len(lons))]
+        return [Point._unchecked(lon, lat, depth) for lon, lat, depth
+                in zip(lons, lats, depths)]
 
     def to_polygon(self, radius):
         """
@@ -19,10 +19,20 @@
 """
 Module :mod:`openquake.hazardlib.geo.polygon` defines :class:`Polygon`.
 """
+import math
 import numpy
 import shapely.geometry
 import shapely.wkt
+try:  # shapely >= 2.0
+    from shapely import intersects_xy
+except ImportError:  # shapely.vectorized is deprecated in shapely 2.0
+    import shapely.vectorized
 
+    def intersects_xy(geom, x, y):
+        return (shapely.vectorized.contains(geom, x, y) |
+                shapely.vectorized.touches(geom, x, y))
+
+from openquake.baselib.performance import compile
 from openquake.hazardlib.geo.mesh import Mesh
 from openquake.hazardlib.geo import geodetic
 from openquake.hazardlib.geo import utils
@@ -46,14 +56,16 @@ class Polygon(object):
         perimeter intersects itself.
     """
     _bbox = None
+    _xxyy = None  # coordinates of the vertices of the projected polygon
 
     def __init__(self, points):
         points = utils.clean_points(points)
         if len(points) < 3:
             raise ValueError('polygon must have at least 3 unique vertices')
 
-        self.lons = numpy.array([float(point.longitude) for point in points])
-        self.lats = numpy.array([float(point.latitude) for point in points])
+        n = len(points)
+        self.lons = numpy.fromiter((p.longitude for p in points), float, n)
+        self.lats = numpy.fromiter((p.latitude for p in points), float, n)
         if utils.line_intersects_itself(self.lons, self.lats, closed_shape=1):
             raise ValueError('polygon perimeter intersects itself')
 
@@ -154,7 +166,8 @@ class Polygon(object):
     def _init_polygon2d(self):
         """
         Spherical bounding box, projection, and Cartesian polygon are all
-        cached to prevent redundant computations.
+        cached to prevent redundant computations, as well as the Cartesian
+        coordinates of the polygon vertices used by :meth:`discretize`.
 
         If any of them are `None`, recalculate all of them.
         """
@@ -173,6 +186,11 @@ class Polygon(object):
             # a shapely polygon object:
             xx, yy = self._projection(lons, lats)
             self._polygon2d = shapely.geometry.Polygon(list(zip(xx, yy)))
+            self._xxyy = None
+
+        if self._xxyy is None:
+            # NB: the last point of the ring repeats the first one
+            self._xxyy = numpy.array(self._polygon2d.exterior.coords[:-1]).T
 
     def dilate(self, dilation):
         """
@@ -212,7 +230,9 @@ class Polygon(object):
         """
         self._init_polygon2d()
         pxx, pyy = self._projection(mesh.lons, mesh.lats)
-        return utils.point_to_polygon_distance(self._polygon2d, pxx, pyy) == 0
+        # a single vectorized call instead of building a shapely Point
+        # for each point of the mesh
+        return intersects_xy(self._polygon2d, pxx, pyy)
 
     def discretize(self, mesh_spacing):
         """
@@ -226,31 +246,53 @@ class Polygon(object):
         """
         self._init_polygon2d()
         west, east, north, south = self._bbox
-        lons, lats = [], []
-        # we cover the bounding box (in spherical coordinates) from highest
-        # to lowest latitude and from left to right by longitude. we step
-        # by mesh spacing distance (linear measure). we check each point
-        # if it is inside the polygon and yield the point object, if so.
-        # this way we produce an uniformly-spaced mesh regardless of the
-        # latitude.
-        latitude = north
-        while latitude > south:
-            longitude = west
-            while utils.get_longitudinal_extent(longitude, east) > 0:
-                # we use Cartesian space just for checking if a point
-                # is inside of the polygon.
-                x, y = self._projection(longitude, latitude)
-                if self._polygon2d.contains(shapely.geometry.Point(x, y)):
-                    lons.append(longitude)
-                    lats.append(latitude)
-
-                # move by mesh spacing along parallel...
-                longitude, _, = geodetic.point_at(longitude, latitude,
-                                                  90, mesh_spacing)
-            # ... and by the same distance along meridian in outer one
-            _, latitude = geodetic.point_at(west, latitude, 180, mesh_spacing)
-
-        return Mesh(numpy.array(lons), numpy.array(lats), depths=None)
+        lons, lats = _grid(west, east, north, south, mesh_spacing)
+        # we use Cartesian space just for checking if a point
+        # is inside of the polygon
+        xx, yy = self._projection(lons, lats)
+        inside = _inside(xx, yy, *self._xxyy)
+        return Mesh(lons[inside], lats[inside], depths=None)
+
+
+def _grid(west, east, north, south, mesh_spacing):
+    # we cover the bounding box (in spherical coordinates) from highest
+    # to lowest latitude and from left to right by longitude. we step
+    # by mesh spacing distance (linear measure). this way we produce an
+    # uniformly-spaced mesh regardless of the latitude. On the sphere
+    # the steps of geodetic.point_at have a closed form: moving along the
+    # meridian (azimuth 180) decreases the latitude by the angular
+    # distance, while moving along the parallel (azimuth 90) increases
+    # the longitude by atan(tan(dist) / cos(lat)), a constant for each row
+    dist = mesh_spacing / geodetic.EARTH_RADIUS
+    dlat = math.degrees(dist)
+    lats = north - dlat * numpy.arange(math.ceil((north - south) / dlat))
+    lats = lats[lats > south]
+    dlons = numpy.degrees(numpy.arctan2(
+        math.tan(dist), numpy.cos(numpy.radians(lats))))
+    extent = utils.get_longitudinal_extent(west, east)
+    counts = numpy.maximum(numpy.ceil(extent / dlons), 0).astype(int)
+    rows = numpy.repeat(numpy.arange(len(lats)), counts)
+    steps = numpy.arange(counts.sum()) - numpy.repeat(
+        numpy.cumsum(counts) - counts, counts)
+    lons = west + steps * dlons[rows]
+    lons[lons >= 180] -= 360  # crossing the international date line
+    ok = utils.get_longitudinal_extent(lons, east) > 0
+    return lons[ok], lats[rows][ok]
+
+
+@compile("b1[:](f8[:], f8[:], f8[:], f8[:])")
+def _inside(xx, yy, pxx, pyy):
+    # ray-crossing test of the points (xx, yy) against the polygon of
+    # vertices (pxx, pyy), vectorized on the points
+    inside = numpy.zeros(len(xx), numpy.bool_)
+    j = len(pxx) - 1
+    for i in range(len(pxx)):
+        xi, yi, xj, yj = pxx[i], pyy[i], pxx[j], pyy[j]
+        if yi != yj:  # horizontal edges are never crossed
+            inside ^= (((yi > yy) != (yj > yy)) &
+                       (xx < (xj - xi) * (yy - yi) / (yj - yi) + xi))
+        j = i
+    return inside
 
 
 def get_resampled_coordinates(lons, lats):
@@ -275,24 +317,22 @@ def get_resampled_coordinates(lons, lats):
     lats2 = numpy.concatenate((lats1[1:], lats1[:1]))
     distances = geodetic.geodetic_distance(lons1, lats1, lons2, lats2)
 
-    resampled_lons = [lons[0]]
-    resampled_lats = [lats[0]]
-    for i in range(num_coords):
-        next_point = (i + 1) % num_coords
-        lon1, lat1 = lons[i], lats[i]
-        lon2, lat2 = lons[next_point], lats[next_point]
-        distance = distances[i]
-        num_points = int(distance / UPSAMPLING_STEP_KM) + 1
-        if num_points >= 2:
-            # We need to increase the resolution of this arc by adding new
-            # points.
-            new_lons, new_lats, _ = geodetic.npoints_between(
-                lon1, lat1, 0, lon2, lat2, 0, num_points)
-            resampled_lons.extend(new_lons[1:])
-            resampled_lats.extend(new_lats[1:])
-        else:
-            resampled_lons.append(lon2)
-            resampled_lats.append(lat2)
+    # number of points added by each segment (its first one is skipped):
+    # more than one only if we need to increase the resolution of the arc
+    counts = numpy.maximum((distances / UPSAMPLING_STEP_KM).astype(int), 1)
+    # the new points of all segments are computed at once: `segs` is the
+    # index of the segment of each point and `steps` its position on it
+    ends = numpy.cumsum(counts)
+    segs = numpy.repeat(numpy.arange(num_coords), counts)
+    steps = numpy.arange(1, ends[-1] + 1) - numpy.repeat(ends - counts, counts)
+    azimuths = geodetic.azimuth(lons1, lats1, lons2, lats2)
+    new_lons, new_lats = geodetic.point_at(
+        lons1[segs], lats1[segs], azimuths[segs],
+        steps * (distances / counts)[segs])
+    # the last point of each segment should be left intact
+    new_lons[ends - 1] = lons2
+    new_lats[ends - 1] = lats2
 
     # NB: we cut off the last point because it repeats the first one
-    return numpy.array(resampled_lons[:-1]), numpy.array(resampled_lats[:-1])
+    return (numpy.concatenate([lons1[:1], new_lons[:-1]]),
+            numpy.concatenate([lats1[:1], new_lats[:-1]]))
@@ -167,10 +167,14 @@ class PlanarSurface(BaseSurface):
         :param array3N: an array of shape (3, N)
         :returns: a :class:`PlanarSurface` instance
         """
-        tl, tr, bl, br = [Point(*p) for p in array3N.T]
-        strike = tl.azimuth(tr)
-        dip = numpy.degrees(
-            numpy.arcsin((bl.depth - tl.depth) / tl.distance(bl)))
+        # the corners keep the precision of the array (float32 for the
+        # ruptures in the datastore) and so do the strike and the dip
+        tl, tr, bl, br = [Point._unchecked(*p) for p in array3N.T]
+        lons, lats, deps = array3N
+        strike = geodetic.azimuth(lons[0], lats[0], lons[1], lats[1])
+        dist = geodetic.distance(lons[0], lats[0], deps[0],
+                                 lons[2], lats[2], deps[2])
+        dip = numpy.degrees(numpy.arcsin((deps[2] - deps[0]) / dist))
         # this is used when the planar surface geometry comes from an array
         # in the datastore, which means it is correct and there is no need to
         # check it again; also the check would fail because of a bug, see
@@ -207,6 +207,18 @@ def clean_points(points):
     if not points:
         return points
 
+    # compute the distances between consecutive points in a single
+    # vectorized call: in the common case of no close points there is
+    # nothing to remove and the pairwise comparisons can be skipped
+    n = len(points)
+    lons = numpy.fromiter((p.longitude for p in points), float, n)
+    lats = numpy.fromiter((p.latitude for p in points), float, n)
+    deps = numpy.fromiter((p.depth for p in points), float, n)
+    dists = geodetic.distance(lons[:-1], lats[:-1], deps[:-1],
+                              lons[1:], lats[1:], deps[1:])
+    if (dists > points[0].EQUALITY_DISTANCE).all():
+        return list(points)
+
     result = [points[0]]
     for point in points:
         if point != result[-1]:
@@ -351,14 +363,12 @@ def get_spherical_bounding_box(lons, lats):
         # points are lying on both sides of the international date line
         # (meridian 180). the actual west longitude is the lowest positive
         # longitude and east one is the highest negative.
-        if hasattr(lons, 'flatten'):
-            # fixes test_surface_crossing_international_date_line
-            lons = lons.flatten()
-        west = min(lon for lon in lons if lon > 0)
-        east = max(lon for lon in lons if lon < 0)
-        if not all((get_longitudinal_extent(west, lon) >= 0
-                    and get_longitudinal_extent(lon, east) >= 0)
-                   for lon in lons):
+        # NB: flattening fixes test_surface_crossing_international_date_line
+        lons = numpy.asarray(lons).flatten()
+        west = lons[lons > 0].min()
+        east = lons[lons < 0].max()
+        if not ((get_longitudinal_extent(west, lons) >= 0) &
+                (get_longitudinal_extent(lons, east) >= 0)).all():
             raise ValueError('points collection has longitudinal extent '
                              'wider than 180 deg')
     return SphericalBB(west, east, north, south)
@@ -432,7 +442,7 @@ class OrthographicProjection(object):
                                  'center lon=%s lat=%s' %
                                  (numpy.degrees(self.lambda0),
                                   numpy.degrees(self.phi0)))
-            xx = numpy.cos(phis) * numpy.sin(lambdas)
+            xx = cos_phis * numpy.sin(lambdas)
             yy = (self.cos_phi0 * numpy.sin(phis) - self.sin_phi0 * cos_phis
                   * numpy.cos(lambdas))
             return xx * EARTH_RADIUS, yy * EARTH_RADIUS
@@ -30,6 +30,7 @@ from scipy.special import ndtr
 
 from openquake.hazardlib.stats import norm_cdf
 from openquake.baselib.general import DeprecationWarning
+from openquake.baselib.performance import compile, numba
 from openquake.hazardlib import imt as imt_module
 from openquake.hazardlib import const
 from openquake.hazardlib.contexts import KNOWN_DISTANCES
@@ -184,6 +185,18 @@ def get_poes(mean_std, loglevels, truncation_level, gsims=(), af=None,
 def _get_poes(mean_std, loglevels, truncation_level, squeeze=False):
     mean, stddev = mean_std  # shape (N, M, G) each
     N, L, G = len(mean), len(loglevels.array), mean.shape[-1]
+    if numba:  # fill the array in a single compiled pass
+        imtidx = numpy.zeros(L, numpy.int64)  # level index -> IMT index
+        for m, imt in enumerate(loglevels):
+            imtidx[loglevels(imt)] = m
+        if squeeze:  # shape (N, M) -> (N, M, 1)
+            mean, stddev = mean[:, :, None], stddev[:, :, None]
+        out = numpy.zeros((N, L, mean.shape[-1]))
+        _set_poes(numpy.asarray(mean, float), numpy.asarray(stddev, float),
+                  loglevels.array, imtidx, truncation_level == 0, out)
+        if squeeze:
+            out = out[:, :, 0]
+        return _truncnorm_sf(truncation_level, out)
     out = numpy.zeros((N, L) if squeeze else (N, L, G))
     lvl = 0
     for m, imt in enumerate(loglevels):
@@ -196,6 +209,23 @@ def _get_poes(mean_std, loglevels, truncation_level, squeeze=False):
     return _truncnorm_sf(truncation_level, out)
 
 
+@compile("void(f8[:, :, :], f8[:, :, :], f8[:], i8[:], b1, f8[:, :, :])")
+def _set_poes(mean, stddev, loglevels, imtidx, exact, out):
+    # fill the array `out` of shape (N, L, G) with the normalized
+    # differences between the levels and the means (or with 1 and 0 in
+    # the exact case truncation_level=0); used by _get_poes
+    N, L, G = out.shape
+    for s in range(N):
+        for lvl in range(L):
+            m = imtidx[lvl]
+            iml = loglevels[lvl]
+            for g in range(G):
+                if exact:
+                    out[s, lvl, g] = 1. if iml <= mean[s, m, g] else 0.
+                else:
+                    out[s, lvl, g] = (iml - mean[s, m, g]) / stddev[s, m, g]
+
+
 def _get_poes_site(mean_std, loglevels, truncation_level, ampfun,
                    mag, sitecode, rrup, squeeze=False):
     """
@@ -134,8 +134,12 @@ class ProbabilityMap(dict):
         :returns: a ProbabilityMap dictionary
         """
         dic = cls(shape_y, shape_z)
-        for sid in sids:
-            dic.setdefault(sid, initvalue, dtype)
+        sids = list(sids)
+        # allocate a single array; the curves are views over it
+        array = numpy.empty((len(sids), shape_y, shape_z), dtype)
+        array.fill(initvalue)
+        for sid, arr in zip(sids, array):
+            dic[sid] = ProbabilityCurve(arr)
         return dic
 
     @classmethod
@@ -251,8 +255,13 @@ class ProbabilityMap(dict):
                              (other, self))
         self_sids = set(self)
         other_sids = set(other)
-        for sid in self_sids & other_sids:
-            self[sid] = self[sid] | other[sid]
+        common = list(self_sids & other_sids)
+        if common:
+            # compose all the common curves with a single numpy operation
+            arr1 = numpy.array([self[sid].array for sid in common])
+            arr2 = numpy.array([other[sid].array for sid in common])
+            for sid, array in zip(common, 1. - (1. - arr1) * (1. - arr2)):
+                self[sid] = ProbabilityCurve(array)
         for sid in other_sids - self_sids:
             self[sid] = other[sid]
         return self
@@ -329,7 +338,7 @@ class ProbabilityMap(dict):
         sids = self.sids
         shape = (size, self.shape_y, self.shape_z)
         array = numpy.zeros(shape, F64)
-        for i, sid in numpy.ndenumerate(sids):
+        for i, sid in enumerate(sids):
             try:
                 array[i] = self[sid].array
             except ValueError as exc:
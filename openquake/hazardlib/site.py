@@ -102,13 +102,6 @@ Vs30=760.0000, Depth1.0km=100.0000, Depth2.5km=5.0000>'
         return self.__str__()
 
 
-def _extract(array_or_float, indices):
-    try:  # if array
-        return array_or_float[indices]
-    except TypeError:  # if float
-        return array_or_float
-
-
 # dtype of each valid site parameter
 site_param_dt = {
     'sids': numpy.uint32,
@@ -327,13 +320,13 @@ class SiteCollection(object):
                   for p in ('sids', 'lon', 'lat', 'depth')] + extra
         self.array = arr = numpy.zeros(len(sites), dtlist)
         self.complete = self
-        for i in range(len(arr)):
-            arr['sids'][i] = i
-            arr['lon'][i] = sites[i].location.longitude
-            arr['lat'][i] = sites[i].location.latitude
-            arr['depth'][i] = sites[i].location.depth
-            for p, dt in extra:
-                arr[p][i] = getattr(sites[i], p)
+        # fill the columns at once, not site by site
+        arr['sids'] = numpy.arange(len(sites), dtype=numpy.uint32)
+        arr['lon'] = [site.location.longitude for site in sites]
+        arr['lat'] = [site.location.latitude for site in sites]
+        arr['depth'] = [site.location.depth for site in sites]
+        for p, dt in extra:
+            arr[p] = [getattr(site, p) for site in sites]
 
         # protect arrays from being accidentally changed. it is useful
         # because we pass these arrays directly to a GMPE through
@@ -376,10 +369,13 @@ class SiteCollection(object):
 
         :param hint: hint for how many tiles to generate
         """
+        if len(self) == 0:  # nothing to split
+            return [self]
         tiles = []
-        for seq in split_in_blocks(range(len(self)), hint or 1):
+        # the tiles are contiguous, so they are extracted with plain slices
+        for slc in split_in_blocks(len(self), hint or 1):
             sc = SiteCollection.__new__(SiteCollection)
-            sc.array = self.array[numpy.array(seq, int)]
+            sc.array = self.array[slc]
             sc.complete = self
             tiles.append(sc)
         return tiles
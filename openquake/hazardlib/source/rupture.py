@@ -127,7 +127,8 @@ def _get_rupture(rec, geom=None, trt=None):
     rupture.surface = object.__new__(surface_cls)
     rupture.mag = rec['mag']
     rupture.rake = rec['rake']
-    rupture.hypocenter = geo.Point(*rec['hypo'])
+    # keep the single precision of the stored hypocenter
+    rupture.hypocenter = geo.Point._unchecked(*rec['hypo'])
     rupture.occurrence_rate = rec['occurrence_rate']
     try:
         rupture.probs_occur = rec['probs_occur']
@@ -88,14 +88,24 @@ def quantile_curve(quantile, curves, weights=None):
     else:
         weights = numpy.array(weights)
         assert len(weights) == R, (len(weights), R)
-    result = numpy.zeros(curves.shape[1:])
-    for idx, _ in numpy.ndenumerate(result):
-        data = numpy.array([a[idx] for a in curves])
-        sorted_idxs = numpy.argsort(data)
-        cum_weights = numpy.cumsum(weights[sorted_idxs])
-        # get the quantile from the interpolated CDF
-        result[idx] = numpy.interp(quantile, cum_weights, data[sorted_idxs])
-    return result
+    # sort all the curves at once, for each point of the curves
+    sorted_idxs = numpy.argsort(curves, axis=0)
+    data = numpy.take_along_axis(curves, sorted_idxs, axis=0)
+    if R == 1:
+        return numpy.array(data[0], float)
+    cum_weights = numpy.cumsum(weights[sorted_idxs], axis=0)
+    # get the quantile from the interpolated CDF; this is a vectorized
+    # version of numpy.interp(quantile, cum_weights, data) on the first axis
+    j = numpy.clip((cum_weights <= quantile).sum(axis=0) - 1, 0, R - 2)
+    x0 = numpy.take_along_axis(cum_weights, j[None], axis=0)[0]
+    x1 = numpy.take_along_axis(cum_weights, j[None] + 1, axis=0)[0]
+    y0 = numpy.take_along_axis(data, j[None], axis=0)[0]
+    y1 = numpy.take_along_axis(data, j[None] + 1, axis=0)[0]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        result = (y1 - y0) / (x1 - x0) * (quantile - x0) + y0
+    result = numpy.where(quantile == x0, y0, result)
+    result = numpy.where(quantile < cum_weights[0], data[0], result)
+    return numpy.where(quantile >= cum_weights[-1], data[-1], result)
 
 
 def max_curve(values, weights=None):
@@ -146,7 +156,7 @@ def compute_pmap_stats(pmaps, stats, weights, imtls):
         if sum(w) == 0:  # expect no data for this IMT
             continue
         for i, array in enumerate(compute_stats(curves[:, :, slc], stats, w)):
-            for j, sid in numpy.ndenumerate(sids):
+            for j, sid in enumerate(sids):
                 out[sid].array[slc, i] = array[j]
     return out
 
@@ -188,8 +198,13 @@ def compute_stats2(arrayNR, stats, weights):
     newshape[1] = len(stats)  # number of statistical outputs
     newarray = numpy.zeros(newshape, arrayNR.dtype)
     data = [arrayNR[:, i] for i in range(len(weights))]
+    names = arrayNR.dtype.names
     for i, func in enumerate(stats):
-        newarray[:, i] = apply_stat(func, data, weights)
+        if names:  # write the fields directly, without an intermediate array
+            for name in names:
+                newarray[name][:, i] = func([d[name] for d in data], weights)
+        else:
+            newarray[:, i] = func(data, weights)
     return newarray
 
 
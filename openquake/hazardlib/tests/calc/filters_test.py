@@ -16,7 +16,9 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake.  If not, see <http://www.gnu.org/licenses/>.
 import os
+import pickle
 import unittest
+import numpy
 from numpy.testing import assert_almost_equal as aae
 from openquake.baselib.general import gettemp
 from openquake.hazardlib import nrml
@@ -56,6 +58,20 @@ class SourceFilterTestCase(unittest.TestCase):
         sites = srcfilter.get_close_sites(src)
         self.assertIsNotNone(sites)
 
+    def test_sids_within(self):
+        # the KD-trees give the same sites as sitecol.within_bbox, also
+        # across the International Date Line and after pickling
+        rng = numpy.random.RandomState(42)
+        lons = (rng.uniform(170, 190, 200) + 180) % 360 - 180
+        sitecol = SiteCollection.from_points(lons, rng.uniform(-45, -35, 200))
+        srcfilter = SourceFilter(sitecol, MagDepDistance.new('200'))
+        for box in [(171, -42, 175, -38), (178, -44, -177, -36),
+                    (-179, -40, -171, -37)]:
+            expected = sitecol.within_bbox(box)
+            self.assertGreater(len(expected), 0)
+            for sf in (srcfilter, pickle.loads(pickle.dumps(srcfilter))):
+                numpy.testing.assert_equal(sf._sids_within(box), expected)
+
 
 # from https://groups.google.com/d/msg/openquake-users/P03SxJsfW_s/nCdcxj8WAAAJ
 characteric_source = '''\
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import unittest
+from numpy.testing import assert_allclose as aac
 
 from openquake.hazardlib import geo
 
@@ -67,6 +68,30 @@ class LineResampleTestCase(unittest.TestCase):
         self.assertEqual(geo.Line([p1]), geo.Line(
                 [p1, p2, p3]).resample(50.0))
 
+    def test_resample_negative_coords(self):
+        """
+        The resampled coordinates are the same as the ones computed by
+        Point.equally_spaced_points, also for negative coordinates
+        """
+        p1 = geo.Point(-71.4, -33.2, 10.0)
+        p2 = geo.Point(-71.9, -33.75, 25.0)
+        p3 = geo.Point(-72.3, -34.1, 27.5)
+        resampled = geo.Line([p1, p2, p3]).resample(1.0)
+        expected = p1.equally_spaced_points(p2, 1.0)
+        expected.extend(expected[-1].equally_spaced_points(p3, 1.0)[1:])
+        self.assertEqual(len(resampled), len(expected))
+        aac(resampled.coo, [(p.longitude, p.latitude, p.depth)
+                            for p in expected], rtol=0, atol=1E-10)
+
+    def test_resample_half_way(self):
+        # a 2.5 km vertical segment resampled every km: the number of
+        # sections is rounded half away from zero, as in intervals_between
+        p1 = geo.Point(-71.9, -33.75, 25.0)
+        p2 = geo.Point(-71.9, -33.75, 27.5)
+        resampled = geo.Line([p1, p2]).resample(1.0)
+        aac(resampled.coo[:, 2], [25., 26., 27., 28.])
+        aac(resampled.coo[:, :2], [(-71.9, -33.75)] * 4)
+
     def test_resample_4(self):
         """
         When resampling a line with a single point, the result
@@ -93,6 +118,15 @@ class LineCreationTestCase(unittest.TestCase):
         expected = [p1, p2, p4, p5]
         self.assertEqual(expected, geo.Line([p1, p2, p3, p4, p5, p6]).points)
 
+    def test_coo_follows_points(self):
+        p1, p2, p3 = geo.Point(0, 0), geo.Point(0, 1), geo.Point(1, 1, 5)
+        line = geo.Line([p1, p2])
+        line.points.append(p3)
+        aac(line.coo, [[0, 0, 0], [0, 1, 0], [1, 1, 5]])
+        self.assertFalse(line.horizontal())
+        self.assertAlmostEqual(line.get_length(),
+                               p1.distance(p2) + p2.distance(p3))
+
 
 class LineResampleToNumPointsTestCase(unittest.TestCase):
     def test_simple(self):
@@ -154,3 +188,23 @@ class LineLengthTestCase(unittest.TestCase):
         expected_length = line.points[0].distance(line.points[1]) \
                           + line.points[1].distance(line.points[2])
         self.assertEqual(length, expected_length)
+
+
+class LineResampleAtTestCase(unittest.TestCase):
+    def test_simple(self):
+        line = geo.Line([geo.Point(0, 0), geo.Point(0, 1, 10),
+                         geo.Point(1, 1, 10)])
+        d1, d2 = line._segment_lengths()
+        coo = line.resample_at([d1 + d2, 0, d1 / 2, d1, d1 + d2 / 4])
+        aac(coo, [[1, 1, 10], [0, 0, 0], [0, 0.5, 5], [0, 1, 10],
+                  [0.25, 1, 10]], atol=1E-3)
+
+    def test_line_of_one_point(self):
+        line = geo.Line([geo.Point(0, 0)])
+        self.assertRaises(AssertionError, line.resample_at, [0])
+
+    def test_out_of_range(self):
+        line = geo.Line([geo.Point(0, 0), geo.Point(0, 1)])
+        length = line.get_length()
+        self.assertRaises(AssertionError, line.resample_at, [length + 1])
+        self.assertRaises(AssertionError, line.resample_at, [0, -1])
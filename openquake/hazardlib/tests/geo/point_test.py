@@ -38,6 +38,19 @@ class PointPointAtTestCase(unittest.TestCase):
         expected = geo.Point(0.0635916667129, 0.0635916275455, -5.0)
         self.assertEqual(expected, p1.point_at(10.0, -15.0, 45.0))
 
+    def test_point_at_same_as_geodetic(self):
+        # the coordinates are stored as floats, whatever their input type
+        for lon, lat, azimuth in [(-122.0, 37.2, 44.96),
+                                  (numpy.float32(-122.0),
+                                   numpy.float32(37.2), 44.96),
+                                  (numpy.int64(-122), numpy.array(37.2),
+                                   numpy.float16(44.96))]:
+            p = geo.Point(lon, lat, 9.0).point_at(7.5, 0.0, azimuth)
+            expected = geo.geodetic.point_at(
+                float(lon), float(lat), float(azimuth), 7.5)
+            self.assertEqual((p.longitude, p.latitude), expected)
+            self.assertIs(type(p.longitude), float)
+
 
 class PointAzimuthTestCase(unittest.TestCase):
     def test_azimuth(self):
@@ -59,6 +72,15 @@ class PointDistanceTestCase(unittest.TestCase):
 
         self.assertAlmostEqual(78.7849704355, p1.distance(p2), places=4)
 
+    def test_distance_same_as_geodetic(self):
+        p1 = geo.Point(179.9, -45.2, 3.0)
+        for p2 in [geo.Point(-179.8, -44.9, 10.0), geo.Point(10, 80, -1.0),
+                   geo.Point(179.9, -45.2, 3.0)]:
+            expected = geo.geodetic.distance(
+                p1.longitude, p1.latitude, p1.depth,
+                p2.longitude, p2.latitude, p2.depth)
+            self.assertAlmostEqual(expected, p1.distance(p2), places=9)
+
 
 class PointEquallySpacedPointsTestCase(unittest.TestCase):
     def test_equally_spaced_points_1(self):
@@ -23,7 +23,9 @@ import unittest.mock as mock
 import numpy
 from copy import deepcopy
 
+from openquake.baselib.general import DictArray
 from openquake.hazardlib import const
+from openquake.hazardlib.gsim import base
 from openquake.hazardlib.gsim.base import (
     GMPE, CoeffsTable, SitesContext, RuptureContext,
     NotVerifiedWarning, DeprecationWarning)
@@ -356,3 +358,45 @@ class CoeffsTableTestCase(unittest.TestCase):
         self.assertEqual(str(te.exception),
                          "CoeffsTable cannot be constructed with "
                          "inputs of the form 'int'")
+
+
+class GetPoesTestCase(unittest.TestCase):
+    # the compiled branch of _get_poes (_set_poes) and the numpy branch
+    # must give the same PoEs, whether numba is installed or not
+
+    def setUp(self):
+        rng = numpy.random.RandomState(42)
+        self.loglevels = DictArray({'PGA': numpy.log([.01, .1, .2, .4]),
+                                    'SA(1.0)': numpy.log([.05, .15, .3])})
+        mean = numpy.log(rng.random_sample((5, 2, 3)))  # shape (N, M, G)
+        # put some means exactly on the levels, for the exact case
+        mean[0, 0] = numpy.log(.1)
+        mean[1, 1] = numpy.log(.15)
+        stddev = rng.random_sample((5, 2, 3)) + .2
+        self.mean_std = numpy.array([mean, stddev])
+
+    def test_set_poes(self):
+        # _set_poes against the numpy computation of the normalized
+        # differences between the levels and the means
+        levels = self.loglevels.array
+        imtidx = numpy.array([0, 0, 0, 0, 1, 1, 1])
+        mean, stddev = self.mean_std
+        for exact in (True, False):
+            out = numpy.zeros((5, 7, 3))
+            base._set_poes(mean, stddev, levels, imtidx, exact, out)
+            ms, ss = mean[:, imtidx], stddev[:, imtidx]  # shape (N, L, G)
+            lvls = levels[None, :, None]
+            expected = lvls <= ms if exact else (lvls - ms) / ss
+            aac(out, expected, rtol=1E-15)
+
+    def test_both_branches(self):
+        for trunc in (0, None, 3):
+            for squeeze in (False, True):
+                ms = self.mean_std[:, :, :, 1] if squeeze else self.mean_std
+                with mock.patch.object(base, 'numba', None):
+                    expected = base._get_poes(
+                        ms, self.loglevels, trunc, squeeze)
+                with mock.patch.object(base, 'numba', True):
+                    poes = base._get_poes(ms, self.loglevels, trunc, squeeze)
+                self.assertEqual(poes.shape, expected.shape)
+                aac(poes, expected, rtol=1E-15, atol=0)
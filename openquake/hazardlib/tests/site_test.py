@@ -147,6 +147,13 @@ class SiteCollectionCreationTestCase(unittest.TestCase):
         tiles = cll.split_in_tiles(2)
         self.assertEqual(len(tiles), 2)
 
+        # an empty collection is returned as a single tile
+        empty = SiteCollection.__new__(SiteCollection)
+        empty.array = cll.array[:0]
+        tiles = empty.split_in_tiles(2)
+        self.assertEqual(len(tiles), 1)
+        self.assertIs(tiles[0], empty)
+
         # test geohash
         assert_eq(cll.geohash(4), numpy.array([b's5x1', b'7zrh']))
 
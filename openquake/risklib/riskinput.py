@@ -76,8 +76,10 @@ def get_output(crmodel, assets_by_taxo, haz, rlzi=None):
                if col.startswith('gmv_')]
         data = numpy.array(lst).T  # shape (E, M)
     elif isinstance(haz, numpy.ndarray):
-        # ebrisk
-        haz.sort(order='eid')
+        # ebrisk; sorting in place by the scalar key, which is much
+        # faster than a structured sort and it is fine since the eids
+        # of a site are unique
+        haz[:] = haz[numpy.argsort(haz['eid'], kind='stable')]
         eids = haz['eid']
         data = haz['gmv']  # shape (E, M)
     elif haz == 0:  # no hazard for this site (event based)
@@ -129,10 +131,7 @@ class RiskInput(object):
         self.hazard_getter = hazard_getter
         self.assets = assets
         self.weight = len(assets)
-        aids = []
-        for asset in self.assets:
-            aids.append(asset['ordinal'])
-        self.aids = numpy.array(aids, numpy.uint32)
+        self.aids = numpy.array(assets['ordinal'], numpy.uint32)
 
     def gen_outputs(self, crmodel, monitor, tempname=None, haz=None):
         """
@@ -182,8 +181,7 @@ def make_eps(asset_array, num_samples, seed, correlation):
         logging.info('Building %s epsilons for taxonomy %s', shape, taxonomy)
         zeros = numpy.zeros(shape)
         epsilons = scientific.make_epsilons(zeros, seed, correlation)
-        for asset, epsrow in zip(assets, epsilons):
-            eps[asset['ordinal']] = epsrow
+        eps[assets['ordinal']] = epsilons
     return eps
 
 
@@ -202,7 +200,7 @@ def cache_epsilons(dstore, oq, assetcol, crmodel, E):
     else:  # event based
         if oq.asset_correlation:
             numpy.random.seed(oq.master_seed)
-            eps = numpy.array([numpy.random.normal(size=E)] * A)
+            eps = numpy.tile(numpy.random.normal(size=E), (A, 1))
         else:
             seeds = oq.master_seed + numpy.arange(E)
             eps = numpy.zeros((A, E), F32)
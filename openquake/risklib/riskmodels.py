@@ -204,7 +204,7 @@ def rescale(curves, values):
     A, _, C = curves.shape
     assert A == len(values), (A, len(values))
     array = numpy.zeros((A, C), loss_poe_dt)
-    array['loss'] = [c * v for c, v in zip(curves[:, 0], values)]
+    array['loss'] = curves[:, 0] * values[:, None]
     array['poe'] = curves[:, 1]
     return array
 
@@ -286,8 +286,9 @@ class RiskModel(object):
         lratios = self.loss_ratios[loss_type]
         imls = self.hazard_imtls[vf.imt]
         values = get_values(loss_type, assets)
-        lrcurves = numpy.array(
-            [scientific.classical(vf, imls, hazard_curve, lratios)] * n)
+        lrcurve = scientific.classical(vf, imls, hazard_curve, lratios)
+        # the same curve for all the assets, broadcast without copying
+        lrcurves = numpy.broadcast_to(lrcurve, (n,) + lrcurve.shape)
         return rescale(lrcurves, values)
 
     def event_based_risk(self, loss_type, assets, gmvs, eids, epsilons):
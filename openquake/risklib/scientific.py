@@ -1440,17 +1440,16 @@ class LossCurvesMapsBuilder(object):
     def build_curves(self, loss_arrays, rlzi):
         if len(loss_arrays) == 0:
             return ()
-        shp = loss_arrays[0].shape  # (L, T...)
+        loss_arrays = numpy.asarray(loss_arrays)  # shape (E, L, T...)
+        shp = loss_arrays.shape[1:]  # (L, T...)
         P = len(self.return_periods)
         curves = numpy.zeros((P,) + shp, F32)
         num_events = self.num_events.get(rlzi, 0)
-        acc = collections.defaultdict(list)
-        for loss_array in loss_arrays:
-            for idx, loss in numpy.ndenumerate(loss_array):
-                acc[idx].append(loss)
-        for idx, losses in acc.items():
+        for idx in numpy.ndindex(*shp):
+            # the losses of all events for the given loss type and tags
             curves[(slice(None),) + idx] = losses_by_period(
-                losses, self.return_periods, num_events, self.eff_time)
+                loss_arrays[(slice(None),) + idx], self.return_periods,
+                num_events, self.eff_time)
         return curves
 
 
@@ -1485,11 +1484,10 @@ class LossesByAsset(object):
         """
         for lt in out.loss_types:
             lratios = out[lt]  # shape (A, E)
-            losses = numpy.zeros_like(lratios)
             avalues = (out.assets['occupants_None'] if lt == 'occupants'
                        else out.assets['value-' + lt])
-            for a, avalue in enumerate(avalues):
-                losses[a] = avalue * lratios[a]
+            # multiply with the same precision of the loss ratios
+            losses = lratios * avalues[:, None].astype(lratios.dtype)
             yield self.lni[lt], losses  # shape (A, E)
             if lt in self.policy_dict:
                 ins_losses = numpy.zeros_like(lratios)
@@ -1499,27 +1497,28 @@ class LossesByAsset(object):
                         losses[a], ded * avalues[a], lim * avalues[a])
                 yield self.lni[lt + '_ins'], ins_losses
 
-    def aggregate(self, out, eids, minimum_loss, tagidxs, ws):
+    def aggregate(self, out, eidxs, minimum_loss, tagidxs, ws):
         """
         Populate .losses_by_A, .losses_by_E and .alt
+
+        :param eidxs: the indices of out.eids in .losses_by_E
+        :param tagidxs: the aggregation key of each asset, as an integer
         """
         numlosses = numpy.zeros(2, int)
         for lni, losses in self.gen_losses(out):
             if ws is not None:  # compute avg_losses, really fast
                 aids = out.assets['ordinal']
                 self.losses_by_A[aids, lni] += losses @ ws
-            for eid, loss in zip(eids, losses.sum(axis=0)):
-                self.losses_by_E[eid][lni] += loss
+            # the eidxs are distinct, since there is a GMF per event
+            self.losses_by_E[eidxs, lni] += losses.sum(axis=0)
             if tagidxs is not None:
                 # this is the slow part, depending on minimum_loss
-                for a, asset in enumerate(out.assets):
-                    idx = ','.join(map(str, tagidxs[a])) + ','
-                    kept = 0
-                    for loss, eid in zip(losses[a], out.eids):
-                        if loss >= minimum_loss[lni]:
-                            self.alt[idx][eid][lni] += loss
-                            kept += 1
-                    numlosses += numpy.array([kept, len(losses[a])])
+                oks = losses >= minimum_loss[lni]  # shape (A, E)
+                numlosses += numpy.array([oks.sum(), losses.size])
+                for a in numpy.where(oks.any(axis=1))[0]:
+                    ok = oks[a]
+                    self.alt[tagidxs[a]].append(
+                        (lni, eidxs[ok], losses[a, ok]))
         return numlosses
 
 